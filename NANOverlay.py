@@ -1,15 +1,127 @@
+import time
+PROCESS_STARTED_AT = time.perf_counter()
+import functools
+import importlib.util
+import json
+import os
+import re
 import sys
+import threading
+import traceback
+import zipimport
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from PyQt5 import sip
 from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QWidget, QPushButton, QLabel
-from PyQt5.QtGui import QIcon, QPainter, QColor, QPixmap, QCursor, QFont
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QPoint, QPropertyAnimation, QEasingCurve
-from pynput import keyboard
+from PyQt5.QtGui import (
+    QIcon, QImage, QWindow, QPainter, QColor, QPixmap, QFont, QFontMetrics, QStaticText, QTransform, QRegion
+)
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QObject, QTimer, QPoint, QRect, QSize, QVariantAnimation, QEasingCurve,
+    QFileSystemWatcher, QEvent
+)
+from appbundle import (
+    APP_BUNDLE_SUFFIX, close_app_bundle, is_app_bundle, open_app_bundle, read_bundle_manifest_text
+)
+from launcher import control_socket_in_use, control_socket_path, send_command
+keyboard = None
 SETTINGS_PANEL_SIZE = (350, 350)
 SETTINGS_HEADER_HEIGHT = 30
 FADE_DURATION_MS = 250
+OVERLAY_BACKGROUND_RGBA = (23, 22, 22, 204)
+OVERLAY_TEXT_TOP = 5
+FADE_MODES = ("auto", "instant", "opacity", "snapshot", "reduced")
+FADE_AUTO_ORDER = ("opacity", "reduced", "snapshot", "instant")
+FADE_FRAME_BUDGET_MS = 25.0
+FADE_AUTO_SAMPLE_FADES = 2
+FADE_REDUCED_STEPS = 5
+RESIDENT_OVERLAY = True
+OVERLAY_PREWARM_DELAY_MS = 500
+STARTUP_INPUT_DELAY_MS = 0
+OVERLAY_OPEN_TARGET_MS = 33
 DEFAULT_TRIGGER_KEY = "F5"
 BASE_DIR = Path(__file__).resolve().parent
-SETTINGS_FILE = BASE_DIR / "ressources" / "settings.novres"
+SETTINGS_FILE = Path(os.environ.get("NANOVERLAY_SETTINGS_FILE") or BASE_DIR / "ressources" / "settings.novres")
+SETTINGS_FLUSH_DELAY_MS = 250
+SETTINGS_HOTKEY_KEY = "key"
+SETTINGS_PANEL_POS_KEY = "panel_pos"
+APPS_DIR = Path(os.environ.get("NANOVERLAY_APPS_DIR") or BASE_DIR / "apps")
+APP_MANIFEST_NAME = "info.novr"
+APP_MODULE_NAME = "app.py"
+APP_INDEX_FILE = Path(os.environ.get("NANOVERLAY_APP_INDEX") or BASE_DIR / "ressources" / "apps_index.json")
+APP_INDEX_VERSION = 1
+APP_EXECUTION_MODES = ("inprocess", "worker", "isolated")
+APP_WORKER_POOL_SIZE = 2
+HOT_RELOAD_ENABLED = os.environ.get("NANOVERLAY_HOT_RELOAD", "1") not in ("", "0")
+HOT_RELOAD_DEBOUNCE_MS = 200
+APP_WORKER_HEARTBEAT_MS = 1000
+APP_WORKER_HANG_TIMEOUT_S = 5.0
+APP_WORKER_STOP_TIMEOUT_S = 0.5
+APP_WORKER_RESTART_BACKOFF_MS = 500
+APP_WORKER_RESTART_BACKOFF_MAX_MS = 30000
+APP_WORKER_MAX_RESTARTS = 5
+APP_WORKER_STABLE_S = 60.0
+ASSETS_DIR = BASE_DIR / "ressources"
+ASSET_CACHE_BUDGET_BYTES = int(os.environ.get("NANOVERLAY_ASSET_BUDGET") or 16 * 1024 * 1024)
+ASSET_PRELOAD = (("sett.png", (32, 32)), ("tray.png", None))
+APP_BUTTON_ICON_NAME = "button.png"
+ASYNC_OFFLOAD_WORKERS = 4
+ASYNC_OFFLOAD_MAX_PENDING = 64
+ASYNC_STOP_TIMEOUT_S = 1.0
+WATCHDOG_ENABLED = os.environ.get("NANOVERLAY_WATCHDOG", "1") not in ("", "0")
+WATCHDOG_HEARTBEAT_MS = 100
+WATCHDOG_STALL_MS = 250
+WATCHDOG_MAX_RECORDS = 200
+WATCHDOG_STACK_DEPTH = 12
+WATCHDOG_LOG_FILE = Path(os.environ.get("NANOVERLAY_STALL_LOG") or BASE_DIR / "nanoverlay_stalls.log")
+APP_ACCOUNTING_INTERVAL_MS = 1000
+APP_ACCOUNTING_TRACEMALLOC = os.environ.get("NANOVERLAY_TRACEMALLOC", "") not in ("", "0")
+APP_BUDGET_CPU_PERCENT = 25.0
+APP_BUDGET_MEMORY_MB = 256
+APP_BUDGET_PAINT_MS_PER_S = 100.0
+APP_BUDGET_ACTIONS = ("throttle", "suspend", "off")
+APP_BUDGET_GRACE_SAMPLES = 3
+APP_THROTTLE_MAX_FACTOR = 8
+TICK_FRAME_MS = 16
+TICK_WHEEL_SLOTS = 64
+TICK_FRAME_BUDGET_MS = 4.0
+TICK_CALLBACK_BUDGET_MS = 2.0
+TICK_DEFAULT_RATE_HZ = 30
+APP_WINDOW_DEFAULT_SIZE = (300, 200)
+APP_FRAME_RATE_HZ = 30
+APP_RENDER_THREADS = 2
+APP_WINDOW_HEADER_HEIGHT = 30
+APP_WINDOW_CASCADE_ORIGIN = (60, 80)
+APP_WINDOW_CASCADE_STEP = 30
+APP_TASKBAR_TAB_SIZE = (160, 26)
+APP_TASKBAR_MARGIN = 10
+APP_TASKBAR_SPACING = 6
+TRACE_ENABLED = os.environ.get("NANOVERLAY_TRACE", "") not in ("", "0")
+TRACE_FILE = Path(os.environ.get("NANOVERLAY_TRACE_FILE") or BASE_DIR / "nanoverlay_trace.json")
+TRACE_MAX_EVENTS = 100000
+TRACE_SAMPLE_WINDOW = 1024
+TRACE_HISTOGRAM_BUCKETS_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, 266)
+TOGGLE_BINDING_ID = "overlay.toggle"
+HOTKEY_SUPPRESS_AUTOREPEAT = True
+HOTKEY_MIN_TOGGLE_INTERVAL_MS = 150
+HOTKEY_MODIFIERS = ("CTRL", "ALT", "SHIFT", "CMD")
+INPUT_BACKENDS = ("pynput", "qt", "replay")
+DEFAULT_INPUT_BACKEND = os.environ.get("NANOVERLAY_INPUT_BACKEND") or "pynput"
+HOTKEY_MODIFIER_ALIASES = {
+    "CONTROL": "CTRL",
+    "OPTION": "ALT",
+    "META": "CMD",
+    "WIN": "CMD",
+    "SUPER": "CMD",
+}
+
+
+SPECIAL_KEY_NAMES = frozenset(
+    ["ESC", "ENTER", "RETURN", "SPACE", "TAB"] + [f"F{index}" for index in range(1, 25)]
+)
+SPECIAL_PYNPUT_KEYS = {}
+MODIFIER_PYNPUT_KEYS = {}
 
 
 def _build_special_key_map():
@@ -27,61 +139,408 @@ def _build_special_key_map():
     return mapping
 
 
-SPECIAL_PYNPUT_KEYS = _build_special_key_map()
+def _build_modifier_key_map():
+    mapping = {}
+    groups = (
+        ("CTRL", ("ctrl", "ctrl_l", "ctrl_r")),
+        ("ALT", ("alt", "alt_l", "alt_r", "alt_gr")),
+        ("SHIFT", ("shift", "shift_l", "shift_r")),
+        ("CMD", ("cmd", "cmd_l", "cmd_r")),
+    )
+    for modifier, attrs in groups:
+        for attr in attrs:
+            if hasattr(keyboard.Key, attr):
+                mapping[getattr(keyboard.Key, attr)] = modifier
+    return mapping
+
+
+def load_keyboard_backend():
+    global keyboard
+    if keyboard is None:
+        from pynput import keyboard as pynput_keyboard
+        keyboard = pynput_keyboard
+        SPECIAL_PYNPUT_KEYS.update(_build_special_key_map())
+        MODIFIER_PYNPUT_KEYS.update(_build_modifier_key_map())
+    return keyboard
 
 
 def is_valid_hotkey_name(name):
     if not name:
         return False
     value = name.upper()
-    if value in SPECIAL_PYNPUT_KEYS:
+    if value in SPECIAL_KEY_NAMES:
         return True
     return len(value) == 1 and value.isalnum()
 
 
-def normalize_hotkey_name(name):
+def parse_hotkey(name):
     if not name:
         return None
-    trimmed = name.strip().upper()
-    if is_valid_hotkey_name(trimmed):
-        return trimmed
-    return None
+    parts = [part.strip().upper() for part in name.strip().split("+")]
+    if any(not part for part in parts):
+        return None
+    key = parts[-1]
+    if not is_valid_hotkey_name(key):
+        return None
+    modifiers = set()
+    for part in parts[:-1]:
+        modifier = HOTKEY_MODIFIER_ALIASES.get(part, part)
+        if modifier not in HOTKEY_MODIFIERS:
+            return None
+        modifiers.add(modifier)
+    return frozenset(modifiers), key
+
+
+def format_hotkey(modifiers, key):
+    return "+".join([modifier for modifier in HOTKEY_MODIFIERS if modifier in modifiers] + [key])
+
+
+def normalize_hotkey_name(name):
+    parsed = parse_hotkey(name)
+    if parsed is None:
+        return None
+    return format_hotkey(*parsed)
+
+
+def parse_key_value_text(text):
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        values[key.strip()] = value.strip()
+    return values
+
+
+def format_settings_text(values):
+    return "".join(f"{key}={value}\n" for key, value in values.items())
+
+
+def _write_text_atomic(path, text):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+class SettingsStore(QObject):
+    changed = pyqtSignal(object)
+
+    def __init__(self, path=SETTINGS_FILE, flush_delay_ms=SETTINGS_FLUSH_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._values = {}
+        self._dirty = set()
+        self._last_written_text = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settings-writer")
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_delay_ms)
+        self._flush_timer.timeout.connect(self.flush)
+        self.flush_count = 0
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except OSError:
+            text = None
+        if text is None:
+            self._values = {SETTINGS_HOTKEY_KEY: DEFAULT_TRIGGER_KEY}
+            self._schedule_flush()
+        else:
+            self._values = parse_key_value_text(text)
+            self._last_written_text = text
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._watch)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._watcher.addPath(str(self.path.parent))
+        self._watch()
 
+    def _watch(self, *args):
+        path = str(self.path)
+        if path not in self._watcher.files() and self.path.exists():
+            self._watcher.addPath(path)
 
-def ensure_settings_file():
-    SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    if not SETTINGS_FILE.exists():
-        SETTINGS_FILE.write_text(f"key={DEFAULT_TRIGGER_KEY}\n", encoding="utf-8")
+    def get(self, key, default=None):
+        return self._values.get(key, default)
 
+    def get_int(self, key, default=0):
+        try:
+            return int(self._values[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_float(self, key, default=0.0):
+        try:
+            return float(self._values[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_bool(self, key, default=False):
+        value = self._values.get(key)
+        if value is None:
+            return default
+        return value.lower() in ("1", "true", "yes", "on")
+
+    def get_point(self, key, default=None):
+        value = self._values.get(key)
+        if not value:
+            return default
+        x, _, y = value.partition(",")
+        try:
+            return QPoint(int(x), int(y))
+        except ValueError:
+            return default
+
+    def set(self, key, value):
+        if isinstance(value, bool):
+            text = "true" if value else "false"
+        elif isinstance(value, QPoint):
+            text = f"{value.x()},{value.y()}"
+        else:
+            text = str(value)
+        if "\n" in text or "\r" in text:
+            raise ValueError("settings values must be single-line")
+        if self._values.get(key) == text:
+            return
+        self._values[key] = text
+        self._dirty.add(key)
+        self._schedule_flush()
+
+    def remove(self, key):
+        if self._values.pop(key, None) is not None:
+            self._dirty.add(key)
+            self._schedule_flush()
+
+    def get_app_setting(self, app_id, name, default=None):
+        return self.get(f"app.{app_id}.{name}", default)
+
+    def set_app_setting(self, app_id, name, value):
+        self.set(f"app.{app_id}.{name}", value)
+
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
 
-def load_hotkey_from_file():
-    ensure_settings_file()
-    for line in SETTINGS_FILE.read_text(encoding="utf-8").splitlines():
-        if line.startswith("key="):
-            value = normalize_hotkey_name(line[4:])
-            if value is not None:
-                return value
-    return save_hotkey_to_file(DEFAULT_TRIGGER_KEY)
+    def flush(self):
+        self._flush_timer.stop()
+        if not self._dirty and self._last_written_text is not None:
+            return None
+        text = format_settings_text(self._values)
+        self._dirty.clear()
+        self._last_written_text = text
+        self.flush_count += 1
+        return self._executor.submit(self._write, text)
 
+    def _write(self, text):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_text_atomic(self.path, text)
+        except OSError:
+            return False
+        return True
 
-def save_hotkey_to_file(key_name):
-    normalized = normalize_hotkey_name(key_name) or DEFAULT_TRIGGER_KEY
-    ensure_settings_file()
-    SETTINGS_FILE.write_text(f"key={normalized}\n", encoding="utf-8")
-    return normalized
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _on_file_changed(self, path):
+        self._watch()
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except OSError:
+            return
+        if text == self._last_written_text:
+            return
+        external = parse_key_value_text(text)
+        changed_keys = set()
+        for key in set(self._values) | set(external):
+            if key in self._dirty:
+                continue
+            value = external.get(key)
+            if self._values.get(key) == value:
+                continue
+            if value is None:
+                del self._values[key]
+            else:
+                self._values[key] = value
+            changed_keys.add(key)
+        self._last_written_text = text
+        if changed_keys:
+            self.changed.emit(changed_keys)
 
 
-def pynput_key_matches_hotkey(pynput_key, hotkey_name):
-    target = hotkey_name.upper()
-    special = SPECIAL_PYNPUT_KEYS.get(target)
+def hotkey_key_identity(key_name):
+    special = SPECIAL_PYNPUT_KEYS.get(key_name)
     if special is not None:
-        return pynput_key == special
-    if isinstance(pynput_key, keyboard.KeyCode) and pynput_key.char:
-        return pynput_key.char.upper() == target
-    return False
+        return special
+    return key_name
 
 
-def qt_key_event_to_name(event):
+def pynput_key_identity(pynput_key):
+    if isinstance(pynput_key, keyboard.KeyCode):
+        char = pynput_key.char
+        if not char:
+            return None
+        if len(char) == 1 and ord(char) < 32:
+            char = chr(ord(char) + 64)
+        return char.upper()
+    return pynput_key
+
+
+class InputEventScheduler:
+    def __init__(
+        self,
+        suppress_autorepeat=HOTKEY_SUPPRESS_AUTOREPEAT,
+        min_toggle_interval_ms=HOTKEY_MIN_TOGGLE_INTERVAL_MS,
+    ):
+        self.suppress_autorepeat = suppress_autorepeat
+        self.min_toggle_interval = min_toggle_interval_ms / 1000.0
+        self.held = set()
+        self._lock = threading.Lock()
+        self._toggle_pending = False
+        self._last_toggle_at = None
+        self.received = 0
+        self.repeats_dropped = 0
+        self.throttled = 0
+        self.coalesced = 0
+        self.delivered = 0
+
+    def on_binding_press(self, identity, callback):
+        self.received += 1
+        if self.suppress_autorepeat:
+            if identity in self.held:
+                self.repeats_dropped += 1
+                return False
+            self.held.add(identity)
+        callback()
+        return True
+
+    def on_key_release(self, identity):
+        self.held.discard(identity)
+
+    def submit_toggle(self):
+        now = time.perf_counter()
+        with self._lock:
+            if self._toggle_pending:
+                self.coalesced += 1
+                return False
+            if (
+                self._last_toggle_at is not None and
+                now - self._last_toggle_at < self.min_toggle_interval
+            ):
+                self.throttled += 1
+                return False
+            self._toggle_pending = True
+            self._last_toggle_at = now
+        return True
+
+    def toggle_consumed(self):
+        with self._lock:
+            if self._toggle_pending:
+                self._toggle_pending = False
+                self.delivered += 1
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "repeats_dropped": self.repeats_dropped,
+            "throttled": self.throttled,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+        }
+
+
+class HotkeyRegistry:
+    def __init__(self, scheduler=None, backend=None):
+        self._bindings = {}
+        self._table = {}
+        self._pressed_modifiers = set()
+        self.scheduler = scheduler
+        if backend is None:
+            self._key_identity = hotkey_key_identity
+            self._event_identity = pynput_key_identity
+            self._modifier_keys = MODIFIER_PYNPUT_KEYS
+        else:
+            self._key_identity = backend.key_identity
+            self._event_identity = backend.event_identity
+            self._modifier_keys = backend.modifier_keys()
+
+    def register(self, binding_id, hotkey_name, callback):
+        parsed = parse_hotkey(hotkey_name)
+        if parsed is None:
+            return None
+        self._bindings[binding_id] = (parsed[0], parsed[1], callback)
+        self._compile()
+        return format_hotkey(*parsed)
+
+    def unregister(self, binding_id):
+        if self._bindings.pop(binding_id, None) is not None:
+            self._compile()
+
+    def unregister_prefix(self, prefix):
+        stale = [binding_id for binding_id in self._bindings if binding_id.startswith(prefix)]
+        for binding_id in stale:
+            del self._bindings[binding_id]
+        if stale:
+            self._compile()
+
+    def bindings(self):
+        return {
+            binding_id: format_hotkey(modifiers, key)
+            for binding_id, (modifiers, key, _callback) in self._bindings.items()
+        }
+
+    def _compile(self):
+        table = {}
+        uses_modifiers = False
+        for modifiers, key, callback in self._bindings.values():
+            table.setdefault(self._key_identity(key), []).append((modifiers, callback))
+            uses_modifiers = uses_modifiers or bool(modifiers)
+        for identity, candidates in table.items():
+            candidates.sort(key=lambda item: -len(item[0]))
+            table[identity] = tuple(candidates)
+        if uses_modifiers:
+            for modifier_key, modifier in self._modifier_keys.items():
+                table.setdefault(modifier_key, modifier)
+        self._table = table
+
+    def _current_modifiers(self):
+        return frozenset(self._modifier_keys[key] for key in self._pressed_modifiers)
+
+    def _dispatch(self, identity, callback):
+        if self.scheduler is None:
+            callback()
+            return True
+        return self.scheduler.on_binding_press(identity, callback)
+
+    def on_press(self, native_key):
+        identity = self._event_identity(native_key)
+        entry = self._table.get(identity)
+        if entry is None:
+            return False
+        if isinstance(entry, str):
+            self._pressed_modifiers.add(native_key)
+            return False
+        active = self._current_modifiers()
+        for modifiers, callback in entry:
+            if modifiers == active:
+                return self._dispatch(identity, callback)
+        for modifiers, callback in entry:
+            if not modifiers:
+                return self._dispatch(identity, callback)
+        return False
+
+    def on_release(self, native_key):
+        if self._pressed_modifiers:
+            self._pressed_modifiers.discard(native_key)
+        if self.scheduler is not None and self.scheduler.held:
+            self.scheduler.on_key_release(self._event_identity(native_key))
+
+
+def _qt_key_to_name(event):
     key = event.key()
     if Qt.Key_F1 <= key <= Qt.Key_F35:
         return f"F{key - Qt.Key_F1 + 1}"
@@ -97,9 +556,1890 @@ def qt_key_event_to_name(event):
     }
     if key in mapping:
         return mapping[key]
+    if key in (Qt.Key_Control, Qt.Key_Alt, Qt.Key_Shift, Qt.Key_Meta, Qt.Key_AltGr):
+        return None
     text = event.text().strip().upper()
     return text or None
 
+
+def qt_key_event_to_name(event):
+    key_name = _qt_key_to_name(event)
+    if not key_name:
+        return None
+    qt_modifiers = event.modifiers()
+    modifiers = set()
+    if qt_modifiers & Qt.ControlModifier:
+        modifiers.add("CTRL")
+    if qt_modifiers & Qt.AltModifier:
+        modifiers.add("ALT")
+    if qt_modifiers & Qt.ShiftModifier:
+        modifiers.add("SHIFT")
+    if qt_modifiers & Qt.MetaModifier:
+        modifiers.add("CMD")
+    return normalize_hotkey_name(format_hotkey(modifiers, key_name))
+
+
+QT_MODIFIER_KEY_NAMES = {
+    Qt.Key_Control: "CTRL",
+    Qt.Key_Alt: "ALT",
+    Qt.Key_AltGr: "ALT",
+    Qt.Key_Shift: "SHIFT",
+    Qt.Key_Meta: "CMD",
+}
+
+
+class InputBackend:
+    name = None
+
+    def __init__(self):
+        self.on_press = None
+        self.on_release = None
+        self.dispatch_latency = TraceHistogram()
+        self.toggle_latency = TraceHistogram()
+        self.events = 0
+        self.errors = 0
+
+    def key_identity(self, key_name):
+        return key_name
+
+    def event_identity(self, native_key):
+        return native_key
+
+    def modifier_keys(self):
+        return {modifier: modifier for modifier in HOTKEY_MODIFIERS}
+
+    def start(self, on_press, on_release):
+        self.on_press = on_press
+        self.on_release = on_release
+
+    def stop(self):
+        pass
+
+    def deliver(self, pressed, native_key, received_at=None):
+        if received_at is None:
+            received_at = time.perf_counter()
+        handler = self.on_press if pressed else self.on_release
+        if handler is None:
+            return
+        self.events += 1
+        try:
+            handler(native_key)
+        except Exception:
+            self.errors += 1
+        self.dispatch_latency.add((time.perf_counter() - received_at) * 1000.0)
+
+    def stats(self):
+        return {
+            "backend": self.name,
+            "events": self.events,
+            "errors": self.errors,
+            "dispatch": self.dispatch_latency.summary(),
+            "toggle": self.toggle_latency.summary(),
+        }
+
+
+class PynputInputBackend(InputBackend):
+    name = "pynput"
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def key_identity(self, key_name):
+        return hotkey_key_identity(key_name)
+
+    def event_identity(self, native_key):
+        return pynput_key_identity(native_key)
+
+    def modifier_keys(self):
+        load_keyboard_backend()
+        return MODIFIER_PYNPUT_KEYS
+
+    def start(self, on_press, on_release):
+        super().start(on_press, on_release)
+        backend = load_keyboard_backend()
+        self._listener = backend.Listener(
+            on_press=lambda key: self.deliver(True, key),
+            on_release=lambda key: self.deliver(False, key),
+        )
+        self._listener.start()
+
+    def stop(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+class _QtKeyFilter(QObject):
+    def __init__(self, backend):
+        super().__init__()
+        self._backend = backend
+
+    def eventFilter(self, watched, event):
+        kind = event.type()
+        if kind in (QEvent.KeyPress, QEvent.KeyRelease) and isinstance(watched, QWindow):
+            if not event.isAutoRepeat():
+                self._backend.handle_qt_event(kind == QEvent.KeyPress, event)
+        return False
+
+
+class QtInputBackend(InputBackend):
+    name = "qt"
+
+    def __init__(self):
+        super().__init__()
+        self._filter = None
+
+    def start(self, on_press, on_release):
+        super().start(on_press, on_release)
+        self._filter = _QtKeyFilter(self)
+        QApplication.instance().installEventFilter(self._filter)
+
+    def stop(self):
+        if self._filter is not None:
+            app = QApplication.instance()
+            if app is not None:
+                app.removeEventFilter(self._filter)
+            self._filter = None
+
+    def handle_qt_event(self, pressed, event):
+        received_at = time.perf_counter()
+        key_name = QT_MODIFIER_KEY_NAMES.get(event.key()) or _qt_key_to_name(event)
+        if key_name:
+            self.deliver(pressed, key_name, received_at)
+
+
+class ReplayInputBackend(InputBackend):
+    name = "replay"
+
+    def __init__(self):
+        super().__init__()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def replay(self, events, realtime=False):
+        self._stop.clear()
+        started_at = time.perf_counter()
+        for offset_s, action, key_name in events:
+            if self._stop.is_set():
+                break
+            if realtime:
+                scheduled_at = started_at + offset_s
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                received_at = scheduled_at
+            else:
+                received_at = time.perf_counter()
+            self.deliver(action == "press", replay_key_name(key_name), received_at)
+
+    def replay_async(self, events, realtime=True):
+        self.stop()
+        self._thread = threading.Thread(
+            target=self.replay, args=(list(events), realtime), name="nanoverlay-replay", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+
+def replay_key_name(key_name):
+    value = key_name.strip().upper()
+    value = HOTKEY_MODIFIER_ALIASES.get(value, value)
+    if value in HOTKEY_MODIFIERS:
+        return value
+    return normalize_hotkey_name(value) or value
+
+
+def load_key_recording(path):
+    events = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        events.append((float(record["t"]), record["action"], record["key"]))
+    return events
+
+
+INPUT_BACKEND_CLASSES = {
+    "pynput": PynputInputBackend,
+    "qt": QtInputBackend,
+    "replay": ReplayInputBackend,
+}
+
+
+def create_input_backend(name):
+    cls = INPUT_BACKEND_CLASSES.get((name or "").lower(), PynputInputBackend)
+    return cls()
+
+
+def manifest_bool(values, key, default=False):
+    value = values.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def manifest_int(values, key, default=0):
+    try:
+        return int(values.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def manifest_size(values, key, default=None):
+    value = values.get(key)
+    if not value:
+        return default
+    width, sep, height = value.lower().partition("x")
+    try:
+        return int(width), int(height)
+    except ValueError:
+        return default
+
+
+class AppEntry:
+    def __init__(self, app_dir, manifest):
+        self.app_dir = Path(app_dir)
+        self.manifest = manifest
+        self.app_id = manifest.get("app_id") or self.app_dir.name
+        self.name = manifest.get("app_name") or self.app_dir.name
+        self.start_at_launch = manifest_bool(manifest, "start_at_launch")
+        self.has_window = manifest_bool(manifest, "window")
+        self.window_size = manifest_size(manifest, "window_size")
+        self.minimizable = manifest_bool(manifest, "minimizable")
+        self.hotkeys = {
+            key[len("hotkey_"):]: value
+            for key, value in manifest.items()
+            if key.startswith("hotkey_") and value
+        }
+        execution = manifest.get("execution", "inprocess").strip().lower()
+        self.execution = execution if execution in APP_EXECUTION_MODES else "inprocess"
+        self.module = None
+        self.load_error = None
+
+    @property
+    def module_path(self):
+        return self.app_dir / APP_MODULE_NAME
+
+    @property
+    def is_bundle(self):
+        return is_app_bundle(self.app_dir)
+
+    @property
+    def loaded(self):
+        return self.module is not None
+
+    def load(self):
+        if self.module is not None or self.load_error is not None:
+            return self.module
+        module_name = "nanoverlay_app_" + re.sub(r"\W", "_", self.app_id)
+        try:
+            if self.is_bundle:
+                module = self._load_from_bundle(module_name)
+            else:
+                spec = importlib.util.spec_from_file_location(module_name, self.module_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+        except Exception as exc:
+            sys.modules.pop(module_name, None)
+            self.load_error = exc
+            return None
+        self.module = module
+        return module
+
+    def _load_from_bundle(self, module_name):
+        importer = zipimport.zipimporter(str(self.app_dir))
+        importer.invalidate_caches()
+        code = importer.get_code(Path(APP_MODULE_NAME).stem)
+        spec = importlib.util.spec_from_loader(module_name, None, origin=str(self.module_path))
+        module = importlib.util.module_from_spec(spec)
+        module.__file__ = str(self.module_path)
+        sys.modules[module_name] = module
+        exec(code, module.__dict__)
+        return module
+
+
+class AppRegistry:
+    def __init__(self, apps_dir=APPS_DIR, index_file=APP_INDEX_FILE):
+        self.apps_dir = Path(apps_dir)
+        self.index_file = Path(index_file)
+        self.apps = {}
+        self.parsed_count = 0
+
+    def _load_index(self):
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != APP_INDEX_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def _save_index(self, entries):
+        payload = json.dumps({"version": APP_INDEX_VERSION, "entries": entries}, indent=1)
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_file.with_suffix(".tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            pass
+
+    def scan(self):
+        index = self._load_index()
+        new_index = {}
+        apps = {}
+        try:
+            dir_entries = sorted(os.scandir(self.apps_dir), key=lambda item: item.name)
+        except OSError:
+            dir_entries = []
+        for dir_entry in dir_entries:
+            bundle = dir_entry.name.endswith(APP_BUNDLE_SUFFIX)
+            if bundle:
+                manifest_path = dir_entry.path
+                stat_target = dir_entry
+            elif dir_entry.is_dir():
+                manifest_path = os.path.join(dir_entry.path, APP_MANIFEST_NAME)
+                stat_target = manifest_path
+            else:
+                continue
+            try:
+                stat = stat_target.stat() if bundle else os.stat(stat_target)
+            except OSError:
+                continue
+            cached = index.get(manifest_path)
+            if (
+                cached is not None and
+                cached.get("mtime") == stat.st_mtime_ns and
+                cached.get("size") == stat.st_size
+            ):
+                manifest = cached.get("manifest", {})
+            else:
+                try:
+                    if bundle:
+                        manifest = parse_key_value_text(read_bundle_manifest_text(manifest_path))
+                    else:
+                        with open(manifest_path, encoding="utf-8") as handle:
+                            manifest = parse_key_value_text(handle.read())
+                except (OSError, KeyError, ValueError):
+                    continue
+                self.parsed_count += 1
+            new_index[manifest_path] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "manifest": manifest,
+            }
+            entry = AppEntry(dir_entry.path, manifest)
+            previous = self.apps.get(entry.app_id)
+            if previous is not None and previous.manifest == manifest:
+                entry = previous
+            apps[entry.app_id] = entry
+        if new_index != index:
+            self._save_index(new_index)
+        self.apps = apps
+        return apps
+
+    def get(self, app_id):
+        return self.apps.get(app_id)
+
+    def load_startup_apps(self, loader=None):
+        for entry in self.apps.values():
+            if entry.start_at_launch:
+                (loader or AppEntry.load)(entry)
+
+    def open_app(self, app_id, loader=None):
+        entry = self.apps.get(app_id)
+        if entry is None:
+            return None
+        (loader or AppEntry.load)(entry)
+        return entry
+
+    def entry_for_path(self, app_path):
+        app_path = Path(app_path)
+        for entry in self.apps.values():
+            if entry.app_dir == app_path:
+                return entry
+        return None
+
+    def read_entry(self, app_path):
+        app_path = Path(app_path)
+        try:
+            if is_app_bundle(app_path):
+                manifest = parse_key_value_text(read_bundle_manifest_text(app_path))
+            else:
+                manifest = parse_key_value_text((app_path / APP_MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, KeyError, ValueError):
+            return None
+        self.parsed_count += 1
+        return AppEntry(app_path, manifest)
+
+
+class AppReloader(QObject):
+    apps_changed = pyqtSignal(object)
+    assets_changed = pyqtSignal(object)
+
+    def __init__(
+        self,
+        apps_dir=APPS_DIR,
+        assets_dir=ASSETS_DIR,
+        known_paths=None,
+        debounce_ms=HOT_RELOAD_DEBOUNCE_MS,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.known_paths = known_paths
+        self.apps_dir = Path(apps_dir)
+        self.assets_dir = Path(assets_dir)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._pending = set()
+        self._asset_stamps = {}
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._flush)
+        self.events = 0
+
+    def start(self):
+        self._asset_stamps = self._asset_snapshot()
+        self._watch_tree()
+
+    def stop(self):
+        self._debounce.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _watch_tree(self):
+        wanted = [str(self.apps_dir), str(self.assets_dir)]
+        for root in (self.apps_dir, self.assets_dir):
+            try:
+                children = list(os.scandir(root))
+            except OSError:
+                continue
+            for child in children:
+                if child.name.startswith(".") or child.name == "__pycache__":
+                    continue
+                if root == self.assets_dir and self._is_ignored_asset(child.name):
+                    continue
+                wanted.append(child.path)
+                if root == self.apps_dir and child.is_dir():
+                    for name in (APP_MANIFEST_NAME, APP_MODULE_NAME):
+                        path = os.path.join(child.path, name)
+                        if os.path.exists(path):
+                            wanted.append(path)
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [path for path in wanted if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_changed(self, path):
+        self.events += 1
+        self._pending.add(path)
+        self._debounce.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, set()
+        app_paths = set()
+        assets = set()
+        assets_touched = False
+        for path in pending:
+            path = Path(path)
+            if path == self.apps_dir:
+                known = set(self.known_paths()) if self.known_paths is not None else set()
+                app_paths.update(self._app_paths() ^ known)
+                continue
+            if path == self.assets_dir:
+                assets_touched = True
+                continue
+            try:
+                relative = path.relative_to(self.apps_dir)
+                app_paths.add(self.apps_dir / relative.parts[0])
+                continue
+            except ValueError:
+                pass
+            try:
+                name = path.relative_to(self.assets_dir).as_posix()
+            except ValueError:
+                continue
+            if not self._is_ignored_asset(name):
+                assets.add(name)
+                assets_touched = True
+        if assets_touched:
+            stamps = self._asset_snapshot()
+            for name in stamps.keys() | self._asset_stamps.keys():
+                if stamps.get(name) != self._asset_stamps.get(name):
+                    assets.add(name)
+            self._asset_stamps = stamps
+        self._watch_tree()
+        if app_paths:
+            self.apps_changed.emit(sorted(app_paths))
+        if assets:
+            self.assets_changed.emit(assets)
+
+    def _is_ignored_asset(self, name):
+        return (
+            name.startswith(".")
+            or name.endswith(".tmp")
+            or name in (SETTINGS_FILE.name, APP_INDEX_FILE.name)
+            or Path(name).suffix == SETTINGS_FILE.suffix
+        )
+
+    def _asset_snapshot(self):
+        stamps = {}
+        try:
+            children = list(os.scandir(self.assets_dir))
+        except OSError:
+            return stamps
+        for child in children:
+            if child.name == "__pycache__" or self._is_ignored_asset(child.name):
+                continue
+            try:
+                stat = child.stat()
+            except OSError:
+                continue
+            stamps[child.name] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _app_paths(self):
+        try:
+            return {
+                self.apps_dir / child.name
+                for child in os.scandir(self.apps_dir)
+                if child.is_dir() or child.name.endswith(APP_BUNDLE_SUFFIX)
+            }
+        except OSError:
+            return set()
+
+
+class WorkerAppHost:
+    def __init__(self, app_id, conn, lock):
+        self.app_id = app_id
+        self._conn = conn
+        self._lock = lock
+
+    def send(self, command, payload=None):
+        message = {"type": "ui", "app_id": self.app_id, "command": command, "payload": payload}
+        with self._lock:
+            self._conn.send(message)
+
+
+class InProcessAppHost:
+    def __init__(self, app_id, module, controller):
+        self.app_id = app_id
+        self.module = module
+        self._controller = controller
+
+    def send(self, command, payload=None):
+        self._controller.app_ui_command.emit(self.app_id, command, payload)
+        self._controller._on_app_ui_command(self.app_id, command, payload)
+
+
+def _call_app_hook(module, name, *args):
+    hook = getattr(module, name, None)
+    if callable(hook):
+        hook(*args)
+
+
+def _reap_worker(process, conn, reader):
+    if process is not None:
+        process.join(APP_WORKER_STOP_TIMEOUT_S)
+        if process.is_alive():
+            process.kill()
+            process.join(APP_WORKER_STOP_TIMEOUT_S)
+    if reader is not None:
+        reader.join(APP_WORKER_STOP_TIMEOUT_S)
+    if conn is not None:
+        conn.close()
+
+
+def _app_worker_main(conn):
+    send_lock = threading.Lock()
+    hosted = {}
+
+    def reply(message):
+        with send_lock:
+            conn.send(message)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        kind = message.get("type")
+        app_id = message.get("app_id")
+        try:
+            if kind == "ping":
+                reply({"type": "pong", "seq": message.get("seq")})
+            elif kind == "load":
+                entry = AppEntry(message["app_dir"], message["manifest"])
+                module = entry.load()
+                if module is None:
+                    reply({"type": "error", "app_id": app_id, "error": repr(entry.load_error)})
+                    continue
+                host = WorkerAppHost(app_id, conn, send_lock)
+                hosted[app_id] = (module, host)
+                _call_app_hook(module, "start", host)
+                reply({"type": "loaded", "app_id": app_id})
+            elif kind == "event" and app_id in hosted:
+                module, host = hosted[app_id]
+                _call_app_hook(module, "on_event", host, message.get("name"), message.get("payload"))
+            elif kind == "unload" and app_id in hosted:
+                module, host = hosted.pop(app_id)
+                _call_app_hook(module, "stop", host)
+            elif kind == "shutdown":
+                break
+        except Exception as exc:
+            try:
+                reply({"type": "error", "app_id": app_id, "error": repr(exc)})
+            except (OSError, ValueError):
+                break
+    for module, host in hosted.values():
+        try:
+            _call_app_hook(module, "stop", host)
+        except Exception:
+            pass
+
+
+class AppWorker(QObject):
+    message_received = pyqtSignal(object)
+    died = pyqtSignal(object)
+    _reader_closed = pyqtSignal(object)
+
+    def __init__(self, context, parent=None):
+        super().__init__(parent)
+        self._context = context
+        self.app_entries = {}
+        self.process = None
+        self.conn = None
+        self._reader = None
+        self._reader_closed.connect(self._on_reader_closed, Qt.QueuedConnection)
+        self._ping_seq = 0
+        self._last_pong = 0.0
+        self.started_at = 0.0
+        self.failures = 0
+        self.restart_pending = False
+        self.dead = False
+
+    def start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self.process = self._context.Process(
+            target=_app_worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self._reader = threading.Thread(
+            target=self._read_loop, args=(parent_conn,), name="nanoverlay-worker-reader", daemon=True
+        )
+        self._reader.start()
+        self._last_pong = self.started_at = time.monotonic()
+        self.restart_pending = False
+        self.dead = False
+        for entry in self.app_entries.values():
+            self._send_load(entry)
+
+    def stop(self, wait=True):
+        if self.conn is not None:
+            try:
+                self.conn.send({"type": "shutdown"})
+            except (OSError, ValueError):
+                pass
+        handles = (self.process, self.conn, self._reader)
+        self.process = None
+        self.conn = None
+        self._reader = None
+        if wait:
+            _reap_worker(*handles)
+        elif any(handle is not None for handle in handles):
+            threading.Thread(target=_reap_worker, args=handles, name="nanoverlay-worker-reaper", daemon=True).start()
+
+    def send(self, message):
+        if self.conn is None:
+            return False
+        try:
+            self.conn.send(message)
+            return True
+        except (OSError, ValueError):
+            self._mark_dead()
+            return False
+
+    def _send_load(self, entry):
+        return self.send({
+            "type": "load",
+            "app_id": entry.app_id,
+            "app_dir": str(entry.app_dir),
+            "manifest": entry.manifest,
+        })
+
+    def host(self, entry):
+        self.app_entries[entry.app_id] = entry
+        self._send_load(entry)
+
+    def unhost(self, app_id):
+        if self.app_entries.pop(app_id, None) is not None:
+            self.send({"type": "unload", "app_id": app_id})
+
+    def ping(self):
+        self._ping_seq += 1
+        self.send({"type": "ping", "seq": self._ping_seq})
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def is_hung(self, timeout):
+        return time.monotonic() - self._last_pong > timeout
+
+    def _read_loop(self, conn):
+        try:
+            while True:
+                message = conn.recv()
+                if message.get("type") == "pong":
+                    self._last_pong = time.monotonic()
+                else:
+                    self.message_received.emit(message)
+        except (EOFError, OSError, TypeError, ValueError):
+            pass
+        self._reader_closed.emit(conn)
+
+    def _on_reader_closed(self, conn):
+        if conn is self.conn:
+            self._mark_dead()
+
+    def _mark_dead(self):
+        if self.dead:
+            return
+        self.dead = True
+        self.died.emit(self)
+
+
+class AppWorkerPool(QObject):
+    ui_command = pyqtSignal(str, str, object)
+    app_error = pyqtSignal(str, str)
+    app_failed = pyqtSignal(str, str)
+
+    def __init__(self, size=APP_WORKER_POOL_SIZE, parent=None):
+        super().__init__(parent)
+        import multiprocessing
+        self._context = multiprocessing.get_context("spawn")
+        self._size = max(1, size)
+        self._pooled = []
+        self._dedicated = {}
+        self._assignments = {}
+        self.failed_apps = {}
+        self.restart_count = 0
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(APP_WORKER_HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._check_workers)
+
+    def _workers(self):
+        return self._pooled + list(self._dedicated.values())
+
+    def _new_worker(self):
+        worker = AppWorker(self._context, self)
+        worker.message_received.connect(self._on_message, Qt.QueuedConnection)
+        worker.died.connect(self._on_worker_died, Qt.QueuedConnection)
+        worker.start()
+        if not self._heartbeat.isActive():
+            self._heartbeat.start()
+        return worker
+
+    def _pooled_worker(self):
+        if len(self._pooled) < self._size:
+            worker = self._new_worker()
+            self._pooled.append(worker)
+            return worker
+        return min(self._pooled, key=lambda item: len(item.app_entries))
+
+    def is_hosted(self, app_id):
+        return app_id in self._assignments
+
+    def pid_for(self, app_id):
+        worker = self._assignments.get(app_id)
+        if worker is None or worker.process is None:
+            return None, False
+        return worker.process.pid, self._dedicated.get(app_id) is not worker
+
+    def has_failed(self, app_id):
+        return app_id in self.failed_apps
+
+    def host(self, entry):
+        if entry.app_id in self._assignments:
+            return
+        self.failed_apps.pop(entry.app_id, None)
+        if entry.execution == "isolated":
+            worker = self._new_worker()
+            self._dedicated[entry.app_id] = worker
+        else:
+            worker = self._pooled_worker()
+        self._assignments[entry.app_id] = worker
+        worker.host(entry)
+
+    def unhost(self, app_id):
+        worker = self._assignments.pop(app_id, None)
+        if worker is None:
+            return
+        worker.unhost(app_id)
+        if self._dedicated.get(app_id) is worker:
+            del self._dedicated[app_id]
+            worker.stop(wait=False)
+            worker.deleteLater()
+
+    def send_event(self, app_id, name, payload=None):
+        worker = self._assignments.get(app_id)
+        if worker is None:
+            return False
+        return worker.send({"type": "event", "app_id": app_id, "name": name, "payload": payload})
+
+    def shutdown(self):
+        self._heartbeat.stop()
+        for worker in self._workers():
+            worker.stop()
+        self._pooled = []
+        self._dedicated = {}
+        self._assignments = {}
+
+    def _check_workers(self):
+        now = time.monotonic()
+        for worker in self._workers():
+            if worker.restart_pending:
+                continue
+            if not worker.is_alive() or worker.is_hung(APP_WORKER_HANG_TIMEOUT_S):
+                self._restart_worker(worker)
+                continue
+            if worker.failures and now - worker.started_at > APP_WORKER_STABLE_S:
+                worker.failures = 0
+            worker.ping()
+
+    def _on_worker_died(self, worker):
+        if worker.dead and not worker.restart_pending:
+            self._restart_worker(worker)
+
+    def _restart_worker(self, worker):
+        if worker not in self._workers():
+            return
+        worker.stop(wait=False)
+        worker.failures += 1
+        if worker.failures > APP_WORKER_MAX_RESTARTS:
+            self._fail_worker(worker)
+            return
+        worker.restart_pending = True
+        delay_ms = min(
+            APP_WORKER_RESTART_BACKOFF_MS * 2 ** (worker.failures - 1), APP_WORKER_RESTART_BACKOFF_MAX_MS
+        )
+        QTimer.singleShot(delay_ms, lambda worker=worker: self._start_pending(worker))
+
+    def _start_pending(self, worker):
+        if not worker.restart_pending or worker not in self._workers():
+            return
+        worker.start()
+        self.restart_count += 1
+
+    def _fail_worker(self, worker):
+        reason = f"worker restarted {APP_WORKER_MAX_RESTARTS} times without staying up"
+        if worker in self._pooled:
+            self._pooled.remove(worker)
+        for app_id, dedicated in list(self._dedicated.items()):
+            if dedicated is worker:
+                del self._dedicated[app_id]
+        for app_id in list(worker.app_entries):
+            self._assignments.pop(app_id, None)
+            self.failed_apps[app_id] = reason
+            self.app_failed.emit(app_id, reason)
+        worker.app_entries = {}
+        worker.deleteLater()
+
+    def _on_message(self, message):
+        kind = message.get("type")
+        app_id = message.get("app_id") or ""
+        if kind == "ui":
+            self.ui_command.emit(app_id, message.get("command") or "", message.get("payload"))
+        elif kind == "error":
+            self.app_error.emit(app_id, message.get("error") or "")
+
+class TraceHistogram:
+    def __init__(self, bounds_ms=TRACE_HISTOGRAM_BUCKETS_MS):
+        self.bounds_ms = bounds_ms
+        self.buckets = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+        self.samples = deque(maxlen=TRACE_SAMPLE_WINDOW)
+
+    def add(self, duration_ms):
+        index = 0
+        for bound in self.bounds_ms:
+            if duration_ms <= bound:
+                break
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = duration_ms if self.max_ms is None else max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        labels = [f"<={bound}ms" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class PerfTracer:
+    def __init__(self, enabled=False, max_events=TRACE_MAX_EVENTS):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.histograms = {}
+        self._pid = os.getpid()
+
+    def instant(self, name, args=None, category="stage"):
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "p",
+            "ts": time.perf_counter() * 1e6,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def complete(self, name, start, end=None, args=None, category="span"):
+        if not self.enabled:
+            return
+        if end is None:
+            end = time.perf_counter()
+        duration_ms = (end - start) * 1000.0
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": duration_ms * 1000.0,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = TraceHistogram()
+        histogram.add(duration_ms)
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export_chrome_trace(self, path=TRACE_FILE):
+        payload = {
+            "traceEvents": list(self.events),
+            "displayTimeUnit": "ms",
+            "summary": self.summary(),
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_text_atomic(path, json.dumps(payload))
+        return path
+
+    def clear(self):
+        self.events.clear()
+        self.histograms = {}
+
+
+TRACER = PerfTracer(TRACE_ENABLED)
+
+
+def traced_paint(method):
+    @functools.wraps(method)
+    def wrapper(self, event):
+        if not TRACER.enabled:
+            return method(self, event)
+        start = time.perf_counter()
+        result = method(self, event)
+        TRACER.complete(f"{type(self).__name__}.paintEvent", start, category="paint")
+        return result
+    return wrapper
+
+
+class AssetCache:
+    def __init__(self, budget_bytes=ASSET_CACHE_BUDGET_BYTES, base_dir=ASSETS_DIR):
+        self.budget_bytes = budget_bytes
+        self.base_dir = Path(base_dir)
+        self._sources = {}
+        self._variants = {}
+        self._lru = OrderedDict()
+        self.used_bytes = 0
+        self.decodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def resolve(self, name, base_dir=None):
+        path = Path(name)
+        if not path.is_absolute():
+            path = Path(base_dir or self.base_dir) / path
+        return path
+
+    def image(self, name, base_dir=None):
+        path = self.resolve(name, base_dir)
+        key = (path,)
+        image = self._sources.get(path)
+        if image is not None:
+            self._lru.move_to_end(key)
+            return image
+        if is_app_bundle(path.parent):
+            image = self._bundle_image(path)
+        else:
+            image = QImage(str(path))
+        if not image.isNull() and image.format() != QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        self._sources[path] = image
+        self._store(key, image.width() * image.height() * 4)
+        self.decodes += 1
+        return image
+
+    def _bundle_image(self, path):
+        bundle = open_app_bundle(path.parent)
+        if bundle is None or path.name not in bundle:
+            return QImage()
+        image = QImage()
+        image.loadFromData(bundle.view(path.name))
+        return image
+
+    def source_size(self, name, base_dir=None):
+        return self.image(name, base_dir).size()
+
+    def pixmap(self, name, size=None, dpr=1.0, base_dir=None, aspect_mode=Qt.KeepAspectRatio):
+        path = self.resolve(name, base_dir)
+        if size is not None:
+            size = (int(size.width()), int(size.height())) if isinstance(size, QSize) else tuple(size)
+        key = (path, size, round(dpr, 3), int(aspect_mode))
+        pixmap = self._variants.get(key)
+        if pixmap is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        image = self.image(path)
+        if image.isNull():
+            return QPixmap()
+        if size is not None:
+            image = image.scaled(
+                max(1, int(size[0] * dpr)),
+                max(1, int(size[1] * dpr)),
+                aspect_mode,
+                Qt.SmoothTransformation,
+            )
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr if size is not None else 1.0)
+        self._variants[key] = pixmap
+        self._store(key, pixmap.width() * pixmap.height() * 4)
+        return pixmap
+
+    def icon(self, name, base_dir=None):
+        return QIcon(self.pixmap(name, base_dir=base_dir))
+
+    def app_button_icon(self, entry, size, dpr=1.0):
+        if not manifest_bool(entry.manifest, "custom_button_icon", False):
+            return None
+        pixmap = self.pixmap(APP_BUTTON_ICON_NAME, size, dpr, base_dir=entry.app_dir)
+        return None if pixmap.isNull() else pixmap
+
+    def preload(self, assets=ASSET_PRELOAD, dpr=1.0):
+        for name, size in assets:
+            self.pixmap(name, size, dpr)
+
+    def _store(self, key, cost):
+        self._lru[key] = cost
+        self.used_bytes += cost
+        self._evict(keep=key)
+
+    def _drop(self, key):
+        self.used_bytes -= self._lru.pop(key, 0)
+        if len(key) == 1:
+            self._sources.pop(key[0], None)
+        else:
+            self._variants.pop(key, None)
+
+    def _evict(self, keep=None):
+        while self.used_bytes > self.budget_bytes and len(self._lru) > 1:
+            key = next(iter(self._lru))
+            if key == keep:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def invalidate(self, name=None, base_dir=None):
+        if name is None:
+            self._sources.clear()
+            self._variants.clear()
+            self._lru.clear()
+            self.used_bytes = 0
+            return
+        path = self.resolve(name, base_dir)
+        for key in [key for key in self._lru if key[0] == path]:
+            self._drop(key)
+
+    def stats(self):
+        return {
+            "sources": len(self._sources),
+            "variants": len(self._variants),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "decodes": self.decodes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+ASSETS = AssetCache()
+
+
+class AsyncBridge(QObject):
+    _deliver = pyqtSignal(object)
+
+    def __init__(
+        self,
+        offload_workers=ASYNC_OFFLOAD_WORKERS,
+        max_pending=ASYNC_OFFLOAD_MAX_PENDING,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.offload_workers = offload_workers
+        self.max_pending = max_pending
+        self.loop = None
+        self._thread = None
+        self._executor = None
+        self._offload_slots = None
+        self._tasks = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.offloaded = 0
+        self.offload_pending = 0
+        self.offload_peak = 0
+        self._deliver.connect(self._run_delivery, Qt.QueuedConnection)
+
+    @property
+    def running(self):
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self):
+        if self.loop is not None:
+            return self
+        import asyncio
+        ready = threading.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.offload_workers, thread_name_prefix="nanoverlay-offload"
+        )
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(self._executor)
+
+        def run_loop():
+            asyncio.set_event_loop(self.loop)
+            self._offload_slots = asyncio.Semaphore(self.max_pending)
+            self.loop.call_soon(ready.set)
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(target=run_loop, name="nanoverlay-asyncio", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        loop = self.loop
+        if loop is None:
+            return
+        import asyncio
+
+        def cancel_all():
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.call_soon(loop.stop)
+
+        loop.call_soon_threadsafe(cancel_all)
+        self._thread.join(ASYNC_STOP_TIMEOUT_S)
+        if not loop.is_running():
+            loop.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.loop = None
+        self._thread = None
+        self._executor = None
+
+    def submit(self, coroutine, on_done=None):
+        import asyncio
+        self.start()
+        self.submitted += 1
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        self._tasks.add(future)
+        future.add_done_callback(functools.partial(self._on_future_done, on_done))
+        return future
+
+    def _on_future_done(self, on_done, future):
+        self._tasks.discard(future)
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+        if on_done is not None:
+            self._deliver.emit(functools.partial(on_done, future))
+
+    def call_in_gui(self, callback, *args):
+        self._deliver.emit(functools.partial(callback, *args))
+
+    def _run_delivery(self, callback):
+        try:
+            callback()
+        except Exception:
+            pass
+
+    async def offload(self, func, *args, **kwargs):
+        async with self._offload_slots:
+            self.offloaded += 1
+            self.offload_pending += 1
+            self.offload_peak = max(self.offload_peak, self.offload_pending)
+            try:
+                return await self.loop.run_in_executor(
+                    self._executor, functools.partial(func, *args, **kwargs)
+                )
+            finally:
+                self.offload_pending -= 1
+
+    def run_blocking(self, func, *args, on_done=None):
+        return self.submit(self.offload(func, *args), on_done)
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": len(self._tasks),
+            "offloaded": self.offloaded,
+            "offload_peak": self.offload_peak,
+        }
+
+
+class TickHandle:
+    def __init__(self, callback, interval_frames, priority, budget_ms, owner):
+        self.callback = callback
+        self.interval_frames = interval_frames
+        self.base_interval_frames = interval_frames
+        self.priority = priority
+        self.budget_ms = budget_ms
+        self.owner = owner
+        self.active = True
+        self.due_frame = 0
+        self.last_run = None
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.overruns = 0
+        self.deferred = 0
+        self.errors = 0
+
+    def stats(self):
+        return {
+            "owner": self.owner,
+            "interval_frames": self.interval_frames,
+            "priority": self.priority,
+            "calls": self.calls,
+            "mean_ms": self.total_ms / self.calls if self.calls else None,
+            "max_ms": self.max_ms,
+            "overruns": self.overruns,
+            "deferred": self.deferred,
+            "errors": self.errors,
+        }
+
+
+class TickScheduler(QObject):
+    def __init__(
+        self,
+        frame_ms=TICK_FRAME_MS,
+        frame_budget_ms=TICK_FRAME_BUDGET_MS,
+        slots=TICK_WHEEL_SLOTS,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.frame_ms = frame_ms
+        self.frame_budget_ms = frame_budget_ms
+        self._wheel = [[] for _ in range(slots)]
+        self._handles = []
+        self._origin = time.monotonic()
+        self._last_frame = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+        self.suspended = True
+        self.frames = 0
+        self.frame_overruns = 0
+        self.wakeups = 0
+        self.accounting = None
+
+    def _current_frame(self):
+        return int((time.monotonic() - self._origin) * 1000.0 // self.frame_ms)
+
+    def _insert(self, handle):
+        self._wheel[handle.due_frame % len(self._wheel)].append(handle)
+
+    def register(
+        self,
+        callback,
+        rate_hz=TICK_DEFAULT_RATE_HZ,
+        priority=0,
+        budget_ms=TICK_CALLBACK_BUDGET_MS,
+        owner=None,
+    ):
+        interval_frames = max(1, int(round(1000.0 / max(rate_hz, 0.001) / self.frame_ms)))
+        handle = TickHandle(callback, interval_frames, priority, budget_ms, owner)
+        handle.due_frame = self._current_frame() + interval_frames
+        self._handles.append(handle)
+        self._insert(handle)
+        self._arm()
+        return handle
+
+    def unregister(self, handle):
+        if not handle.active:
+            return
+        handle.active = False
+        self._handles.remove(handle)
+        if not self._handles:
+            self._timer.stop()
+
+    def unregister_owner(self, owner):
+        for handle in [handle for handle in self._handles if handle.owner == owner]:
+            self.unregister(handle)
+
+    def scale_owner(self, owner, factor):
+        for handle in self._handles:
+            if handle.owner == owner:
+                handle.interval_frames = max(1, int(handle.base_interval_frames * factor))
+
+    def suspend(self):
+        self.suspended = True
+        self._timer.stop()
+
+    def resume(self):
+        if not self.suspended:
+            return
+        self.suspended = False
+        current = self._current_frame()
+        self._wheel = [[] for _ in self._wheel]
+        for handle in self._handles:
+            handle.due_frame = max(handle.due_frame, current)
+            handle.last_run = None
+            self._insert(handle)
+        self._last_frame = current - 1
+        self._arm()
+
+    def _next_due_frame(self, current):
+        slots = len(self._wheel)
+        for offset in range(slots):
+            frame = current + offset
+            for handle in self._wheel[frame % slots]:
+                if handle.active and handle.due_frame <= frame:
+                    return frame
+        return current + slots
+
+    def _arm(self):
+        if self.suspended or not self._handles:
+            self._timer.stop()
+            return
+        current = self._current_frame()
+        next_frame = self._next_due_frame(current)
+        elapsed_ms = (time.monotonic() - self._origin) * 1000.0
+        self._timer.start(max(0, int(next_frame * self.frame_ms - elapsed_ms)))
+
+    def _collect_due(self, current):
+        slots = len(self._wheel)
+        due = []
+        for frame in range(max(self._last_frame + 1, current - slots + 1), current + 1):
+            slot = self._wheel[frame % slots]
+            keep = []
+            for handle in slot:
+                if not handle.active:
+                    continue
+                if handle.due_frame <= current:
+                    due.append(handle)
+                else:
+                    keep.append(handle)
+            slot[:] = keep
+        self._last_frame = current
+        return due
+
+    def _on_timer(self):
+        if self.suspended:
+            return
+        self.wakeups += 1
+        current = self._current_frame()
+        due = self._collect_due(current)
+        due.sort(key=lambda handle: -handle.priority)
+        frame_start = time.perf_counter()
+        for index, handle in enumerate(due):
+            if not handle.active:
+                continue
+            if index and (time.perf_counter() - frame_start) * 1000.0 > self.frame_budget_ms:
+                self.frame_overruns += 1
+                for deferred in due[index:]:
+                    if deferred.active:
+                        deferred.deferred += 1
+                        deferred.due_frame = current + 1
+                        self._insert(deferred)
+                break
+            now = time.perf_counter()
+            dt = now - handle.last_run if handle.last_run is not None else handle.interval_frames * self.frame_ms / 1000.0
+            handle.last_run = now
+            try:
+                handle.callback(dt)
+            except Exception:
+                handle.errors += 1
+            duration_ms = (time.perf_counter() - now) * 1000.0
+            handle.calls += 1
+            handle.total_ms += duration_ms
+            handle.max_ms = max(handle.max_ms, duration_ms)
+            if handle.budget_ms is not None and duration_ms > handle.budget_ms:
+                handle.overruns += 1
+            TRACER.complete(f"tick.{handle.owner}", now, category="tick")
+            if self.accounting is not None and handle.owner is not None:
+                self.accounting(handle.owner, duration_ms)
+            if handle.active:
+                handle.due_frame = current + handle.interval_frames
+                self._insert(handle)
+        self.frames += 1
+        self._arm()
+
+    def overrunning(self):
+        return [handle.stats() for handle in self._handles if handle.overruns]
+
+    def stats(self):
+        return {
+            "suspended": self.suspended,
+            "frames": self.frames,
+            "wakeups": self.wakeups,
+            "frame_overruns": self.frame_overruns,
+            "callbacks": [handle.stats() for handle in self._handles],
+        }
+
+
+class StallWatchdog(QObject):
+    stall_detected = pyqtSignal(object)
+
+    def __init__(
+        self,
+        heartbeat_ms=WATCHDOG_HEARTBEAT_MS,
+        stall_ms=WATCHDOG_STALL_MS,
+        log_file=WATCHDOG_LOG_FILE,
+        app_resolver=None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_ms = stall_ms
+        self.log_file = Path(log_file) if log_file else None
+        self.app_resolver = app_resolver
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(heartbeat_ms)
+        self._heartbeat.timeout.connect(self._beat)
+        self._lock = threading.Lock()
+        self.records = deque(maxlen=WATCHDOG_MAX_RECORDS)
+        self.stalls = 0
+        self.stalled_ms = 0.0
+        self.worst_ms = 0.0
+        self.per_owner = {}
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._heartbeat.start()
+        self._thread = threading.Thread(target=self._watch, name="nanoverlay-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._heartbeat.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def _watch(self):
+        threshold = self.stall_ms / 1000.0
+        interval = self.heartbeat_ms / 1000.0
+        pending = None
+        while not self._stop.wait(interval):
+            last_beat = self._last_beat
+            overdue = time.monotonic() - last_beat - interval
+            if pending is None:
+                if overdue > threshold:
+                    pending = self._capture(last_beat)
+            elif last_beat != pending["last_beat"]:
+                self._finish(pending, last_beat)
+                pending = None
+
+    def _capture(self, last_beat):
+        frame = sys._current_frames().get(self._main_ident)
+        stack = traceback.extract_stack(frame, limit=WATCHDOG_STACK_DEPTH) if frame is not None else []
+        del frame
+        return {
+            "last_beat": last_beat,
+            "started_at": time.time() - (time.monotonic() - last_beat),
+            "owner": self.attribute(stack),
+            "stack": [f"{item.filename}:{item.lineno} {item.name}" for item in stack],
+        }
+
+    def attribute(self, stack):
+        apps_dir = str(APPS_DIR) + os.sep
+        source_file = os.path.abspath(__file__)
+        for item in reversed(stack):
+            filename = os.path.abspath(item.filename)
+            if filename.startswith(apps_dir):
+                app_dir = Path(filename).relative_to(APPS_DIR).parts[0]
+                app_id = self.app_resolver(app_dir) if self.app_resolver is not None else None
+                return f"app:{app_id or app_dir}"
+        for item in reversed(stack):
+            if os.path.abspath(item.filename) == source_file:
+                return f"handler:{item.name}"
+        return f"other:{stack[-1].name}" if stack else "unknown"
+
+    def _finish(self, pending, resumed_beat):
+        duration_ms = (resumed_beat - pending["last_beat"]) * 1000.0 - self.heartbeat_ms
+        record = {
+            "owner": pending["owner"],
+            "duration_ms": round(duration_ms, 1),
+            "started_at": pending["started_at"],
+            "stack": pending["stack"],
+        }
+        with self._lock:
+            self.records.append(record)
+            self.stalls += 1
+            self.stalled_ms += duration_ms
+            self.worst_ms = max(self.worst_ms, duration_ms)
+            counters = self.per_owner.setdefault(record["owner"], {"stalls": 0, "total_ms": 0.0, "worst_ms": 0.0})
+            counters["stalls"] += 1
+            counters["total_ms"] += duration_ms
+            counters["worst_ms"] = max(counters["worst_ms"], duration_ms)
+        TRACER.instant("stall", {"owner": record["owner"], "duration_ms": record["duration_ms"]}, category="watchdog")
+        if self.log_file is not None:
+            try:
+                with self.log_file.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+        self.stall_detected.emit(record)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "stalls": self.stalls,
+                "stalled_ms": round(self.stalled_ms, 1),
+                "worst_ms": round(self.worst_ms, 1),
+                "per_owner": {owner: dict(counters) for owner, counters in self.per_owner.items()},
+                "recent": list(self.records)[-5:],
+            }
+
+
+def _read_process_usage(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as handle:
+            fields = handle.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None, None
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu_s = (int(fields[11]) + int(fields[12])) / ticks
+    return cpu_s, resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def accounting_app_id(owner):
+    if owner.startswith(("render:", "frames:")):
+        return owner.split(":", 1)[1]
+    return owner
+
+
+class AppUsage:
+    def __init__(self, app_id):
+        self.app_id = app_id
+        self.cpu_s = 0.0
+        self.paint_ms = 0.0
+        self.callbacks = 0
+        self.paints = 0
+        self.memory_bytes = None
+        self.process_cpu_s = None
+        self.shared_process = False
+        self.cpu_percent = 0.0
+        self.paint_ms_per_s = 0.0
+        self.callbacks_per_s = 0.0
+        self.status = "ok"
+        self.throttle_factor = 1
+        self.over_budget = 0
+        self.reason = None
+        self._last_cpu_s = 0.0
+        self._last_paint_ms = 0.0
+        self._last_callbacks = 0
+
+    def row(self):
+        return {
+            "app_id": self.app_id,
+            "cpu_percent": round(self.cpu_percent, 1),
+            "memory_mb": None if self.memory_bytes is None else round(self.memory_bytes / (1024 * 1024), 1),
+            "paint_ms_per_s": round(self.paint_ms_per_s, 1),
+            "callbacks_per_s": round(self.callbacks_per_s, 1),
+            "callbacks": self.callbacks,
+            "shared_process": self.shared_process,
+            "status": self.status,
+            "throttle_factor": self.throttle_factor,
+            "reason": self.reason,
+        }
+
+
+class AppResourceMonitor(QObject):
+    updated = pyqtSignal()
+    budget_exceeded = pyqtSignal(str, str, str)
+
+    def __init__(self, app_controller, interval_ms=APP_ACCOUNTING_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self._app_controller = app_controller
+        self.usages = {}
+        self.cpu_budget_percent = APP_BUDGET_CPU_PERCENT
+        self.memory_budget_mb = APP_BUDGET_MEMORY_MB
+        self.paint_budget_ms_per_s = APP_BUDGET_PAINT_MS_PER_S
+        self.budget_action = "throttle"
+        self._process_cpu = {}
+        self._last_sample = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.sample)
+
+    def configure(self, settings):
+        self.cpu_budget_percent = settings.get_float("app_budget_cpu_percent", APP_BUDGET_CPU_PERCENT)
+        self.memory_budget_mb = settings.get_float("app_budget_memory_mb", APP_BUDGET_MEMORY_MB)
+        self.paint_budget_ms_per_s = settings.get_float("app_budget_paint_ms_per_s", APP_BUDGET_PAINT_MS_PER_S)
+        action = (settings.get("app_budget_action") or "throttle").strip().lower()
+        self.budget_action = action if action in APP_BUDGET_ACTIONS else "throttle"
+
+    def start(self):
+        if self._timer.isActive():
+            return
+        self._process_cpu.clear()
+        for usage in self.usages.values():
+            usage._last_cpu_s = usage.cpu_s
+            usage._last_paint_ms = usage.paint_ms
+            usage._last_callbacks = usage.callbacks
+        if APP_ACCOUNTING_TRACEMALLOC:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        self._last_sample = time.monotonic()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def usage(self, app_id):
+        usage = self.usages.get(app_id)
+        if usage is None:
+            usage = self.usages[app_id] = AppUsage(app_id)
+        return usage
+
+    def charge_callback(self, owner, duration_ms):
+        usage = self.usage(accounting_app_id(owner))
+        usage.cpu_s += duration_ms / 1000.0
+        usage.callbacks += 1
+
+    def charge_cpu(self, app_id, cpu_s):
+        usage = self.usage(app_id)
+        usage.cpu_s += cpu_s
+        usage.callbacks += 1
+
+    def charge_paint(self, app_id, duration_ms):
+        usage = self.usage(app_id)
+        usage.paint_ms += duration_ms
+        usage.paints += 1
+
+    def _app_memory(self):
+        tracemalloc = sys.modules.get("tracemalloc")
+        if tracemalloc is None or not tracemalloc.is_tracing():
+            return {}
+        entries = self._app_controller.app_registry.apps.values()
+        prefixes = [(str(entry.app_dir) + os.sep, entry.app_id) for entry in entries]
+        totals = {}
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            filename = stat.traceback[0].filename
+            for prefix, app_id in prefixes:
+                if filename.startswith(prefix):
+                    totals[app_id] = totals.get(app_id, 0) + stat.size
+                    break
+        return totals
+
+    def sample(self):
+        now = time.monotonic()
+        elapsed = max(1e-3, now - (self._last_sample or now))
+        self._last_sample = now
+        controller = self._app_controller
+        pool = controller.worker_pool
+        memory = self._app_memory()
+        for entry in list(controller.app_registry.apps.values()):
+            hosted = pool is not None and pool.is_hosted(entry.app_id)
+            if not (entry.loaded or hosted or entry.app_id in self.usages):
+                continue
+            usage = self.usage(entry.app_id)
+            if hosted:
+                pid, shared = pool.pid_for(entry.app_id)
+                process_cpu_s, rss = _read_process_usage(pid) if pid else (None, None)
+                usage.shared_process = shared
+                usage.memory_bytes = rss
+                if process_cpu_s is not None and not shared:
+                    previous = self._process_cpu.get(pid, process_cpu_s)
+                    self._process_cpu[pid] = process_cpu_s
+                    usage.cpu_s += process_cpu_s - previous
+            elif entry.app_id in memory:
+                usage.memory_bytes = memory[entry.app_id]
+        for usage in self.usages.values():
+            usage.cpu_percent = (usage.cpu_s - usage._last_cpu_s) / elapsed * 100.0
+            usage.paint_ms_per_s = (usage.paint_ms - usage._last_paint_ms) / elapsed
+            usage.callbacks_per_s = (usage.callbacks - usage._last_callbacks) / elapsed
+            usage._last_cpu_s = usage.cpu_s
+            usage._last_paint_ms = usage.paint_ms
+            usage._last_callbacks = usage.callbacks
+            self._enforce(usage)
+        self.updated.emit()
+
+    def _over_budget(self, usage):
+        if usage.cpu_percent > self.cpu_budget_percent:
+            return f"cpu {usage.cpu_percent:.0f}%"
+        if (
+            usage.memory_bytes is not None and not usage.shared_process and
+            usage.memory_bytes > self.memory_budget_mb * 1024 * 1024
+        ):
+            return f"memory {usage.memory_bytes / (1024 * 1024):.0f} MB"
+        if usage.paint_ms_per_s > self.paint_budget_ms_per_s:
+            return f"paint {usage.paint_ms_per_s:.0f} ms/s"
+        return None
+
+    def _enforce(self, usage):
+        if self.budget_action == "off" or usage.status in ("suspended", "failed"):
+            return
+        reason = self._over_budget(usage)
+        if reason is None:
+            usage.over_budget = 0
+            return
+        usage.over_budget += 1
+        if usage.over_budget < APP_BUDGET_GRACE_SAMPLES:
+            return
+        usage.over_budget = 0
+        usage.reason = reason
+        controller = self._app_controller
+        if self.budget_action == "throttle" and usage.throttle_factor < APP_THROTTLE_MAX_FACTOR:
+            usage.throttle_factor *= 2
+            usage.status = "throttled"
+            controller.throttle_app(usage.app_id, usage.throttle_factor)
+            self.budget_exceeded.emit(usage.app_id, "throttle", reason)
+        else:
+            usage.status = "suspended"
+            controller.suspend_app(usage.app_id)
+            self.budget_exceeded.emit(usage.app_id, "suspend", reason)
+
+    def is_suspended(self, app_id):
+        usage = self.usages.get(app_id)
+        return usage is not None and usage.status == "suspended"
+
+    def reset(self, app_id):
+        usage = self.usages.get(app_id)
+        if usage is not None:
+            usage.status = "ok"
+            usage.throttle_factor = 1
+            usage.over_budget = 0
+            usage.reason = None
+
+    def rows(self):
+        return [usage.row() for usage in sorted(self.usages.values(), key=lambda item: -item.cpu_percent)]
+
+
+class FadeModeSelector:
+    def __init__(
+        self,
+        mode="auto",
+        budget_ms=FADE_FRAME_BUDGET_MS,
+        sample_fades=FADE_AUTO_SAMPLE_FADES,
+        resolved=None,
+    ):
+        self.mode = mode if mode in FADE_MODES else "auto"
+        self.budget_ms = budget_ms
+        self.sample_fades = max(1, sample_fades)
+        self._samples = []
+        self._fades = 0
+        if self.mode != "auto":
+            self.strategy = self.mode
+            self.settled = True
+        elif resolved in FADE_AUTO_ORDER:
+            self.strategy = resolved
+            self.settled = True
+        else:
+            self.strategy = FADE_AUTO_ORDER[0]
+            self.settled = False
+
+    def record(self, strategy, frame_times_ms):
+        if self.settled or strategy != self.strategy or not frame_times_ms:
+            return False
+        self._samples.extend(frame_times_ms)
+        self._fades += 1
+        if self._fades < self.sample_fades:
+            return False
+        ordered = sorted(self._samples)
+        p90 = ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+        self._samples = []
+        self._fades = 0
+        if p90 <= self.budget_ms:
+            self.settled = True
+            return True
+        self.strategy = FADE_AUTO_ORDER[FADE_AUTO_ORDER.index(strategy) + 1]
+        self.settled = self.strategy == FADE_AUTO_ORDER[-1]
+        return True
+
+
 class SettingsButton(QWidget):
     clicked = pyqtSignal()
 
@@ -107,17 +2447,14 @@ class SettingsButton(QWidget):
         super().__init__(parent)
         self.setFixedSize(40, 40)
         self.setCursor(Qt.PointingHandCursor)
-        self.icon = QPixmap("ressources/sett.png")
+        self.icon_size = 32
         self._state = "normal"
         self.setAttribute(Qt.WA_Hover, True)
         self.setMouseTracking(True)
-        self._last_inside = False
-        self._last_mouse_down = False
+        self._hovered = False
+        self._mouse_down = False
         self._lock_state = None
-        self._state_timer = QTimer(self)
-        self._state_timer.setInterval(16)
-        self._state_timer.timeout.connect(self._update_state_from_cursor)
-        self._state_timer.start()
+        self.wakeups = 0
 
     def _set_state(self, state):
         if self._state == state:
@@ -132,41 +2469,70 @@ class SettingsButton(QWidget):
             return QColor(204, 204, 204)
         return QColor(140, 139, 139)
 
+    @traced_paint
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setBrush(self._color())
         painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(self.rect(), 12, 12)
-        if not self.icon.isNull():
-            icon_size = 32
-            x = (self.width() - icon_size) // 2
-            y = (self.height() - icon_size) // 2
-            painter.drawPixmap(x, y, icon_size, icon_size, self.icon)
-
-    def _update_state_from_cursor(self, force=False):
-        if self._lock_state is not None and not force:
-            self._set_state(self._lock_state)
-            return
-        local_pos = self.mapFromGlobal(QCursor.pos())
-        inside = self.rect().contains(local_pos)
-        mouse_down = bool(QApplication.mouseButtons() & Qt.LeftButton)
+        icon = ASSETS.pixmap("sett.png", (self.icon_size, self.icon_size), self.devicePixelRatioF())
+        if not icon.isNull():
+            x = (self.width() - self.icon_size) // 2
+            y = (self.height() - self.icon_size) // 2
+            painter.drawPixmap(x, y, icon)
 
-        if inside and mouse_down:
+    def _refresh_state(self):
+        self.wakeups += 1
+        if self._lock_state is not None:
+            self._set_state(self._lock_state)
+        elif self._hovered and self._mouse_down:
             self._set_state("pressed")
-        elif inside:
+        elif self._hovered:
             self._set_state("hover")
         else:
             self._set_state("normal")
 
-        if (
-            self._lock_state is None and
-            self._last_inside and inside and self._last_mouse_down and not mouse_down
-        ):
-            self.clicked.emit()
+    def enterEvent(self, event):
+        self._hovered = True
+        self._refresh_state()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self._hovered = False
+        self._refresh_state()
+        super().leaveEvent(event)
 
-        self._last_inside = inside
-        self._last_mouse_down = mouse_down
+    def mouseMoveEvent(self, event):
+        if self._mouse_down:
+            inside = self.rect().contains(event.pos())
+            if inside != self._hovered:
+                self._hovered = inside
+                self._refresh_state()
+        super().mouseMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._mouse_down = True
+            self._hovered = self.rect().contains(event.pos())
+            self._refresh_state()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self._mouse_down:
+            self._mouse_down = False
+            self._hovered = self.rect().contains(event.pos())
+            self._refresh_state()
+            if self._hovered and self._lock_state is None:
+                self.clicked.emit()
+        super().mouseReleaseEvent(event)
+
+    def hideEvent(self, event):
+        self._hovered = False
+        self._mouse_down = False
+        if self._lock_state is None:
+            self._set_state("normal")
+        super().hideEvent(event)
 
     def lock_state(self, state="pressed"):
         self._lock_state = state
@@ -174,7 +2540,9 @@ class SettingsButton(QWidget):
 
     def unlock_state(self):
         self._lock_state = None
-        self._update_state_from_cursor(force=True)
+        self._mouse_down = False
+        self._hovered = self.isVisible() and self.underMouse()
+        self._refresh_state()
 
 
 class HotkeyInput(QWidget):
@@ -193,6 +2561,7 @@ class HotkeyInput(QWidget):
         self.setCursor(Qt.PointingHandCursor)
         self._font = QFont("Segoe UI", 12)
 
+    @traced_paint
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
@@ -248,11 +2617,66 @@ class HotkeyInput(QWidget):
         self.capture_finished.emit()
         self.update()
 
-    def set_key(self, key_name):
-        self._current_key = key_name
-        if not self._capturing:
-            self._display_text = key_name
-            self.update()
+    def set_key(self, key_name):
+        self._current_key = key_name
+        if not self._capturing:
+            self._display_text = key_name
+            self.update()
+
+class AppUsageTable(QWidget):
+    COLUMNS = (
+        ("App", "app_id", 0.28),
+        ("CPU %", "cpu_percent", 0.12),
+        ("Mem MB", "memory_mb", 0.14),
+        ("Paint/s", "paint_ms_per_s", 0.14),
+        ("Calls/s", "callbacks_per_s", 0.14),
+        ("State", "status", 0.18),
+    )
+    ROW_HEIGHT = 18
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._font = QFont("Segoe UI", 8)
+        self._header_font = QFont("Segoe UI", 8, QFont.Bold)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+
+    def set_rows(self, rows):
+        if rows == self._rows:
+            return
+        self._rows = rows
+        self.update()
+
+    @traced_paint
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#D9D9D9"))
+        painter.setPen(Qt.black)
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        width = self.width() - 8
+        painter.setFont(self._header_font)
+        self._draw_row(painter, 0, width, [title for title, _key, _share in self.COLUMNS])
+        painter.setFont(self._font)
+        if not self._rows:
+            painter.drawText(self.rect().adjusted(4, self.ROW_HEIGHT, -4, 0), Qt.AlignCenter, "No apps running")
+            return
+        max_rows = self.height() // self.ROW_HEIGHT - 1
+        for index, row in enumerate(self._rows[:max_rows]):
+            painter.setPen(QColor("#A01010") if row["status"] != "ok" else Qt.black)
+            values = []
+            for _title, key, _share in self.COLUMNS:
+                value = row.get(key)
+                values.append("-" if value is None else str(value))
+            self._draw_row(painter, index + 1, width, values)
+
+    def _draw_row(self, painter, index, width, values):
+        x = 4
+        y = index * self.ROW_HEIGHT
+        for (_title, _key, share), value in zip(self.COLUMNS, values):
+            column_width = int(width * share)
+            painter.drawText(QRect(x, y, column_width - 4, self.ROW_HEIGHT), Qt.AlignVCenter | Qt.AlignLeft, value)
+            x += column_width
+
 
 class DraggableHeader(QWidget):
     drag_delta = pyqtSignal(QPoint)
@@ -263,6 +2687,7 @@ class DraggableHeader(QWidget):
         self._normal_color = QColor(128, 128, 128)
         self._drag_color = QColor(158, 158, 158)
         self._current_color = self._normal_color
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
         self._dragging = False
         self._last_global_pos = None
 
@@ -304,6 +2729,7 @@ class DraggableHeader(QWidget):
 
 class SettingsPanel(QWidget):
     panel_closed = pyqtSignal()
+    panel_moved = pyqtSignal(QPoint)
     hotkey_changed = pyqtSignal(str)
     hotkey_capture_started = pyqtSignal()
     hotkey_capture_finished = pyqtSignal()
@@ -313,10 +2739,12 @@ class SettingsPanel(QWidget):
         self.setFixedSize(*SETTINGS_PANEL_SIZE)
         self.setAttribute(Qt.WA_StyledBackground, False)
         self.setAttribute(Qt.WA_NoSystemBackground, False)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
         self.header = DraggableHeader(self)
         self.header.setFixedHeight(SETTINGS_HEADER_HEIGHT)
         self.header.setGeometry(0, 0, self.width(), self.header.height())
         self.header.drag_delta.connect(self._handle_drag)
+        self.header.drag_finished.connect(self._drag_finished)
 
         self.close_button = QPushButton("X", self.header)
         self.close_button.setFixedSize(24, 24)
@@ -341,6 +2769,10 @@ class SettingsPanel(QWidget):
         self.hotkey_input.capture_started.connect(self.hotkey_capture_started)
         self.hotkey_input.capture_finished.connect(self.hotkey_capture_finished)
 
+        self.usage_table = AppUsageTable(self)
+        self._place_usage_table()
+
+    @traced_paint
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, False)
@@ -365,8 +2797,13 @@ class SettingsPanel(QWidget):
         input_x = self.hotkey_label.x() + self.hotkey_label.width() + 12
         input_y = label_y - (self.hotkey_input.height() - self.hotkey_label.height()) // 2
         self.hotkey_input.move(input_x, input_y)
+        self._place_usage_table()
         super().resizeEvent(event)
 
+    def _place_usage_table(self):
+        top = self.hotkey_input.y() + self.hotkey_input.height() + 20
+        self.usage_table.setGeometry(12, top, self.width() - 24, self.height() - top - 12)
+
     def close_panel(self):
         self.hide()
         self.panel_closed.emit()
@@ -374,18 +2811,518 @@ class SettingsPanel(QWidget):
     def _handle_drag(self, delta):
         self.move(self.pos() + delta)
 
+    def _drag_finished(self):
+        self.panel_moved.emit(self.pos())
+
     def _hotkey_selected(self, key_name):
         self.hotkey_changed.emit(key_name)
 
     def set_hotkey_name(self, key_name):
         self.hotkey_input.set_key(key_name)
 
+    def set_usage_rows(self, rows):
+        self.usage_table.set_rows(rows)
+
+class FrameChannelSource:
+    def __init__(self, channel, image_format=QImage.Format_ARGB32_Premultiplied):
+        self.channel = channel
+        self.image_format = image_format
+        self.last_seq = 0
+        self.frame = None
+        self.image = None
+        self.shown = 0
+        self.dropped = 0
+        self.torn = 0
+        self.rejected = 0
+        self.last_error = None
+        self.latency = TraceHistogram()
+
+    def poll(self):
+        frame = self.channel.acquire(self.last_seq)
+        if frame is None:
+            return False
+        self.last_seq = frame.seq
+        self.dropped += frame.dropped
+        if frame.error is None and frame.stride * frame.height > len(frame.data):
+            frame.error = f"frame data is {len(frame.data)} bytes, shorter than its rows"
+        if frame.error is not None:
+            self.image = None
+            self.frame = None
+            self.rejected += 1
+            self.last_error = frame.error
+            TRACER.instant("frame_rejected", {"seq": frame.seq, "error": frame.error}, category="frames")
+            return False
+        self.image = None
+        self.frame = frame
+        self.latency.add(frame.age_ms)
+        self.image = QImage(
+            sip.voidptr(frame.data), frame.width, frame.height, frame.stride, self.image_format
+        )
+        return True
+
+    def draw(self, painter, target):
+        if self.image is None:
+            return False
+        painter.drawImage(target, self.image)
+        if not self.channel.is_intact(self.frame):
+            self.torn += 1
+        self.shown += 1
+        return True
+
+    def close(self):
+        self.image = None
+        self.frame = None
+        self.channel.release()
+        return self.channel.close()
+
+    def stats(self):
+        return {
+            "seq": self.last_seq,
+            "shown": self.shown,
+            "dropped": self.dropped,
+            "torn": self.torn,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+            "latency": self.latency.summary(),
+        }
+
+
+class AppWindow:
+    def __init__(self, entry, position, renderer=None):
+        manifest = entry.manifest
+        width, height = entry.window_size or APP_WINDOW_DEFAULT_SIZE
+        self.app_id = entry.app_id
+        self.title = manifest.get("window_name") or entry.name
+        self.header_height = manifest_int(manifest, "window_header_size", APP_WINDOW_HEADER_HEIGHT)
+        if manifest_bool(manifest, "window_border", True):
+            self.border = manifest_int(manifest, "window_border_size", 1)
+        else:
+            self.border = 0
+        self.minimizable = entry.minimizable
+        self.minimized = False
+        self.entry = entry
+        self.rect = QRect(position, QSize(width, height))
+        self.renderer = renderer
+        self.frame_source = None
+        self.rendered_image = None
+        self.surface = None
+        self.surface_dpr = None
+        self.content_dirty = True
+        self.render_count = 0
+
+    def content_rect(self):
+        return QRect(
+            self.border,
+            self.header_height + self.border,
+            max(0, self.rect.width() - 2 * self.border),
+            max(0, self.rect.height() - self.header_height - 2 * self.border),
+        )
+
+    def header_rect(self):
+        return QRect(0, 0, self.rect.width(), self.header_height)
+
+    def minimize_button_rect(self):
+        if not self.minimizable:
+            return QRect()
+        return QRect(self.rect.width() - self.header_height, 0, self.header_height, self.header_height)
+
+
+class AppWindowCompositor:
+    def __init__(self, widget):
+        self._widget = widget
+        self._font = QFont("Segoe UI", 10)
+        self.windows = []
+        self.moved = None
+        self._drag = None
+        self.blits = 0
+        self.paint_accounting = None
+        self.content_invalidated = None
+
+    def get(self, app_id):
+        for window in self.windows:
+            if window.app_id == app_id:
+                return window
+        return None
+
+    def content_bounds(self, window):
+        return window.content_rect().translated(window.rect.topLeft())
+
+    def invalidate_frame(self, app_id):
+        window = self.get(app_id)
+        if window is not None and not window.minimized:
+            self._widget.update(self.content_bounds(window))
+
+    def open_window(self, entry, renderer=None, position=None):
+        window = self.get(entry.app_id)
+        if window is not None and window.entry is not entry:
+            replacement = AppWindow(entry, window.rect.topLeft(), renderer)
+            replacement.minimized = window.minimized
+            self.windows[self.windows.index(window)] = replacement
+            if self._drag is not None and self._drag[0] is window:
+                self._drag = None
+            self._widget.update(QRegion(window.rect).united(QRegion(replacement.rect)))
+            return replacement
+        if window is not None:
+            self.restore(entry.app_id)
+            self.raise_window(window)
+            return window
+        if position is None:
+            index = len(self.windows)
+            position = QPoint(
+                APP_WINDOW_CASCADE_ORIGIN[0] + index * APP_WINDOW_CASCADE_STEP,
+                APP_WINDOW_CASCADE_ORIGIN[1] + index * APP_WINDOW_CASCADE_STEP,
+            )
+        window = AppWindow(entry, position, renderer)
+        self.windows.append(window)
+        self._widget.update(window.rect)
+        return window
+
+    def close_window(self, app_id):
+        window = self.get(app_id)
+        if window is None:
+            return
+        dirty = QRegion(window.rect)
+        if window.minimized:
+            dirty = dirty.united(self.taskbar_region())
+        self.windows.remove(window)
+        if self._drag is not None and self._drag[0] is window:
+            self._drag = None
+        self._widget.update(dirty)
+
+    def minimize(self, app_id):
+        window = self.get(app_id)
+        if window is not None and window.minimizable and not window.minimized:
+            taskbar = self.taskbar_region()
+            window.minimized = True
+            window.surface = None
+            window.content_dirty = True
+            self._widget.update(QRegion(window.rect).united(taskbar).united(self.taskbar_region()))
+
+    def restore(self, app_id):
+        window = self.get(app_id)
+        if window is not None and window.minimized:
+            taskbar = self.taskbar_region()
+            window.minimized = False
+            self._widget.update(QRegion(window.rect).united(taskbar))
+
+    def taskbar_tabs(self):
+        width, height = APP_TASKBAR_TAB_SIZE
+        top = self._widget.height() - APP_TASKBAR_MARGIN - height
+        tabs = []
+        for window in self.windows:
+            if window.minimized:
+                left = APP_TASKBAR_MARGIN + len(tabs) * (width + APP_TASKBAR_SPACING)
+                tabs.append((window, QRect(left, top, width, height)))
+        return tabs
+
+    def taskbar_region(self):
+        region = QRegion()
+        for _window, rect in self.taskbar_tabs():
+            region = region.united(QRegion(rect))
+        return region
+
+    def tab_at(self, pos):
+        for window, rect in self.taskbar_tabs():
+            if rect.contains(pos):
+                return window
+        return None
+
+    def invalidate_content(self, app_id):
+        window = self.get(app_id)
+        if window is None:
+            return
+        window.content_dirty = True
+        if self.content_invalidated is not None:
+            self.content_invalidated(app_id)
+        if not window.minimized:
+            self._widget.update(window.rect)
+
+    def raise_window(self, window):
+        if self.windows and self.windows[-1] is not window:
+            self.windows.remove(window)
+            self.windows.append(window)
+            self._widget.update(window.rect)
+
+    def move_window(self, window, position):
+        if window.rect.topLeft() == position:
+            return
+        old_rect = QRect(window.rect)
+        window.rect.moveTopLeft(position)
+        if not window.minimized:
+            self._widget.update(QRegion(old_rect).united(QRegion(window.rect)))
+
+    def window_at(self, pos):
+        for window in reversed(self.windows):
+            if not window.minimized and window.rect.contains(pos):
+                return window
+        return None
+
+    def press(self, pos):
+        window = self.tab_at(pos)
+        if window is not None:
+            self.restore(window.app_id)
+            self.raise_window(window)
+            return True
+        window = self.window_at(pos)
+        if window is None:
+            return False
+        self.raise_window(window)
+        local = pos - window.rect.topLeft()
+        if window.minimize_button_rect().contains(local):
+            self.minimize(window.app_id)
+        elif window.header_rect().contains(local):
+            self._drag = (window, local)
+        return True
+
+    def drag_to(self, pos):
+        if self._drag is None:
+            return False
+        window, offset = self._drag
+        self.move_window(window, pos - offset)
+        return True
+
+    def release(self):
+        if self._drag is None:
+            return False
+        window = self._drag[0]
+        self._drag = None
+        if self.moved is not None:
+            self.moved(window.app_id, window.rect.topLeft())
+        return True
+
+    def paint(self, painter, region):
+        bounds = self._widget.rect()
+        dpr = self._widget.devicePixelRatioF()
+        for window in self.windows:
+            if window.minimized or not window.rect.intersects(bounds) or not region.intersects(window.rect):
+                continue
+            painter.drawPixmap(window.rect.topLeft(), self._surface(window, dpr))
+            self.blits += 1
+            if window.frame_source is not None or window.rendered_image is not None:
+                content = self.content_bounds(window)
+                if not region.intersects(content):
+                    continue
+                started_at = time.perf_counter()
+                if window.rendered_image is not None:
+                    painter.drawImage(content.topLeft(), window.rendered_image)
+                if window.frame_source is not None:
+                    window.frame_source.draw(painter, content)
+                if self.paint_accounting is not None:
+                    self.paint_accounting(window.app_id, (time.perf_counter() - started_at) * 1000.0)
+        self._paint_taskbar(painter, region)
+
+    def _paint_taskbar(self, painter, region):
+        tabs = self.taskbar_tabs()
+        if not tabs:
+            return
+        painter.save()
+        painter.setFont(self._font)
+        for window, rect in tabs:
+            if not region.intersects(rect):
+                continue
+            painter.fillRect(rect, Qt.black)
+            painter.fillRect(rect.adjusted(1, 1, -1, -1), QColor(128, 128, 128))
+            painter.setPen(QColor("#FFFFFF"))
+            title_rect = rect.adjusted(8, 0, -8, 0)
+            title = QFontMetrics(self._font).elidedText(window.title, Qt.ElideRight, title_rect.width())
+            painter.drawText(title_rect, Qt.AlignVCenter | Qt.AlignLeft, title)
+        painter.restore()
+
+    def _surface(self, window, dpr):
+        if window.surface is None or window.content_dirty or window.surface_dpr != dpr:
+            window.surface = self._render_surface(window, dpr)
+            window.surface_dpr = dpr
+            window.content_dirty = False
+            window.render_count += 1
+        return window.surface
+
+    def _render_surface(self, window, dpr):
+        width, height = window.rect.width(), window.rect.height()
+        surface = QPixmap(max(1, int(width * dpr)), max(1, int(height * dpr)))
+        surface.setDevicePixelRatio(dpr)
+        surface.fill(Qt.transparent)
+        painter = QPainter(surface)
+        painter.fillRect(0, 0, width, height, Qt.black)
+        header = window.header_rect().adjusted(window.border, window.border, -window.border, 0)
+        painter.fillRect(header, QColor(128, 128, 128))
+        content = window.content_rect()
+        painter.fillRect(content, QColor("#D9D9D9"))
+        painter.setFont(self._font)
+        painter.setPen(QColor("#FFFFFF"))
+        title_rect = header.adjusted(8, 0, -window.header_height, 0)
+        icon_size = max(1, header.height() - 8)
+        icon = ASSETS.app_button_icon(window.entry, (icon_size, icon_size), dpr)
+        if icon is not None:
+            painter.drawPixmap(title_rect.left(), header.top() + (header.height() - icon_size) // 2, icon)
+            title_rect.setLeft(title_rect.left() + icon_size + 6)
+        painter.drawText(title_rect, Qt.AlignVCenter | Qt.AlignLeft, window.title)
+        if window.minimizable:
+            painter.drawText(window.minimize_button_rect(), Qt.AlignCenter, "_")
+        if window.renderer is not None and not content.isEmpty():
+            painter.save()
+            painter.setClipRect(content)
+            painter.translate(content.topLeft())
+            started_at = time.perf_counter()
+            try:
+                window.renderer(painter, content.width(), content.height())
+            except Exception:
+                pass
+            if self.paint_accounting is not None:
+                self.paint_accounting(window.app_id, (time.perf_counter() - started_at) * 1000.0)
+            painter.restore()
+        painter.end()
+        return surface
+
+
+class AppRenderState:
+    def __init__(self, entry, window, dpr):
+        self.app_id = entry.app_id
+        self.render = entry.module.render_frame
+        self.window = window
+        self.size = window.content_rect().size()
+        self.dpr = dpr
+        self.generation = 0
+        self.next_seq = 0
+        self.shown_seq = 0
+        self.in_flight = False
+        self.dirty = True
+        self.rendered = 0
+        self.stale_dropped = 0
+        self.busy_skipped = 0
+        self.errors = 0
+        self.render_ms = TraceHistogram()
+
+
+class AppContentRenderer(QObject):
+    frame_ready = pyqtSignal(str, int, int, object)
+
+    def __init__(self, tick_scheduler, threads=APP_RENDER_THREADS, parent=None):
+        super().__init__(parent)
+        self._ticks = tick_scheduler
+        self._threads = threads
+        self._executor = None
+        self.states = {}
+        self.accounting = None
+        self.frame_ready.connect(self._on_frame_ready, Qt.QueuedConnection)
+
+    def attach(self, entry, window, dpr, rate_hz=None):
+        self.detach(entry.app_id)
+        state = self.states[entry.app_id] = AppRenderState(entry, window, dpr)
+        self._ticks.register(
+            lambda dt, state=state: self._on_tick(state, dt),
+            rate_hz=rate_hz or manifest_int(entry.manifest, "frame_rate", APP_FRAME_RATE_HZ),
+            owner=f"render:{entry.app_id}",
+        )
+        return state
+
+    def detach(self, app_id):
+        state = self.states.pop(app_id, None)
+        if state is None:
+            return
+        state.generation += 1
+        self._ticks.unregister_owner(f"render:{app_id}")
+
+    def invalidate(self, app_id, dpr=None):
+        state = self.states.get(app_id)
+        if state is None:
+            return
+        size = state.window.content_rect().size()
+        dpr = state.dpr if dpr is None else dpr
+        if size != state.size or dpr != state.dpr:
+            state.size = size
+            state.dpr = dpr
+            state.generation += 1
+        state.dirty = True
+
+    def _on_tick(self, state, dt):
+        if not state.dirty:
+            return
+        if state.in_flight:
+            state.busy_skipped += 1
+            return
+        if state.size.isEmpty() or state.window.minimized:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._threads, thread_name_prefix="nanoverlay-render")
+        state.dirty = False
+        state.in_flight = True
+        state.next_seq += 1
+        self._executor.submit(
+            self._render, state, state.generation, state.next_seq, state.size, state.dpr, dt
+        )
+
+    def _render(self, state, generation, seq, size, dpr, dt):
+        started_at = time.perf_counter()
+        cpu_started_at = time.thread_time()
+        image = QImage(
+            max(1, int(size.width() * dpr)), max(1, int(size.height() * dpr)), QImage.Format_ARGB32_Premultiplied
+        )
+        image.setDevicePixelRatio(dpr)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        keep_animating = False
+        try:
+            keep_animating = bool(state.render(painter, size.width(), size.height(), dt))
+        except Exception:
+            state.errors += 1
+            image = None
+        finally:
+            painter.end()
+        state.render_ms.add((time.perf_counter() - started_at) * 1000.0)
+        cpu_s = time.thread_time() - cpu_started_at
+        self.frame_ready.emit(state.app_id, generation, seq, (image, keep_animating, cpu_s))
+
+    def _on_frame_ready(self, app_id, generation, seq, result):
+        image, keep_animating, cpu_s = result
+        if self.accounting is not None:
+            self.accounting(app_id, cpu_s)
+        state = self.states.get(app_id)
+        if state is None:
+            return
+        state.in_flight = False
+        if state.generation != generation:
+            state.stale_dropped += 1
+            return
+        state.dirty = state.dirty or keep_animating
+        if image is None:
+            return
+        if seq <= state.shown_seq:
+            state.stale_dropped += 1
+            return
+        state.shown_seq = seq
+        state.rendered += 1
+        state.window.rendered_image = image
+        widget = self.parent().overlay if self.parent() is not None else None
+        if widget is not None:
+            widget.windows.invalidate_frame(app_id)
+
+    def shutdown(self):
+        for app_id in list(self.states):
+            self.detach(app_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {
+            app_id: {
+                "rendered": state.rendered,
+                "stale_dropped": state.stale_dropped,
+                "busy_skipped": state.busy_skipped,
+                "errors": state.errors,
+                "render": state.render_ms.summary(),
+            }
+            for app_id, state in self.states.items()
+        }
+
+
 class Overlay(QWidget):
-    def __init__(self, app_controller, hotkey_name, panel_open):
+    def __init__(self, app_controller, hotkey_name, panel_open, resident=None):
         super().__init__()
         self._app_controller = app_controller
         self._hotkey_name = hotkey_name
         self._panel_open_requested = panel_open
+        self._resident = RESIDENT_OVERLAY if resident is None else resident
         self.setWindowFlags(
             Qt.FramelessWindowHint |
             Qt.WindowStaysOnTopHint |
@@ -396,27 +3333,76 @@ class Overlay(QWidget):
         self.setFocusPolicy(Qt.StrongFocus)
         screen_geometry = QApplication.primaryScreen().geometry()
         self.setGeometry(screen_geometry)
-        QApplication.setOverrideCursor(Qt.ArrowCursor)
         self._instruction_text = ""
-        self.banner = QPixmap("ressources/banner.png")
+        self._instruction_font = QFont("Segoe UI", 12)
+        self._instruction_metrics = QFontMetrics(self._instruction_font)
+        self._instruction_static = None
+        self._static_layer = None
+        self._render_cache_key = None
+        self.paint_events = 0
+        self.painted_pixels = 0
+        self._banner_size = ASSETS.source_size("banner.png")
+        self.windows = AppWindowCompositor(self)
+        self.windows.moved = self._on_app_window_moved
         self.settings_button = SettingsButton(self)
         self.settings_panel = SettingsPanel(self, hotkey_name)
         self.settings_panel.hide()
         self.settings_panel.panel_closed.connect(self._on_settings_panel_closed)
+        self.settings_panel.panel_moved.connect(self._on_settings_panel_moved)
         self.settings_panel.hotkey_changed.connect(self._on_hotkey_changed)
         self.settings_panel.hotkey_capture_started.connect(self._notify_hotkey_capture_start)
         self.settings_panel.hotkey_capture_finished.connect(self._notify_hotkey_capture_finish)
+        if app_controller is not None:
+            self.windows.paint_accounting = app_controller.resource_monitor.charge_paint
+            self.windows.content_invalidated = self._on_app_content_invalidated
+            app_controller.resource_monitor.updated.connect(self._refresh_usage_table)
         self.settings_button.clicked.connect(self._handle_settings_button)
-        self._fade_anim = QPropertyAnimation(self, b"windowOpacity")
+        self._fade_anim = QVariantAnimation(self)
         self._fade_anim.setDuration(FADE_DURATION_MS)
         self._fade_anim.setEasingCurve(QEasingCurve.InOutQuad)
+        self._fade_anim.valueChanged.connect(self._apply_fade_value)
         self._fade_anim.finished.connect(self._on_fade_finished)
+        self._fade_value = 0.0
+        self._fade_strategy = "opacity"
+        self._fade_frame_times = []
+        self._last_fade_tick = None
+        self._snapshot = None
+        self._snapshot_hidden_children = []
         self._is_fading_out = False
         self._skip_fade = False
+        self._override_cursor_set = False
+        self._open_started_at = None
+        self._fade_in_started_at = None
+        self.setWindowOpacity(0.0)
+        self._position_button()
+        self._center_settings_panel()
+        self._update_instruction_text()
+
+    def is_open(self):
+        return self.isVisible() and not self._is_fading_out
+
+    def open_overlay(self, hotkey_name=None, panel_open=None, started_at=None):
+        self._open_started_at = started_at if started_at is not None else time.perf_counter()
+        self._fade_in_started_at = self._open_started_at
+        if hotkey_name is not None:
+            self.set_hotkey_name(hotkey_name)
+        if panel_open is not None:
+            self._panel_open_requested = panel_open
+        if self._app_controller is not None:
+            self._app_controller.overlay_shown()
+        if self.isVisible():
+            self._start_fade_in(self._fade_value)
+            return
+        self._is_fading_out = False
+        self._skip_fade = False
+        screen_geometry = QApplication.primaryScreen().geometry()
+        if self.geometry() != screen_geometry:
+            self.setGeometry(screen_geometry)
+        if not self._override_cursor_set:
+            QApplication.setOverrideCursor(Qt.ArrowCursor)
+            self._override_cursor_set = True
+        self._fade_value = 0.0
         self.setWindowOpacity(0.0)
-        self.show()
-        self.activateWindow()
-        self.setFocus()
         self._position_button()
         self._center_settings_panel()
         if self._panel_open_requested:
@@ -424,32 +3410,121 @@ class Overlay(QWidget):
         else:
             self.settings_panel.hide()
             self.settings_button.unlock_state()
-        self.update()
-        self._update_instruction_text()
+        self.show()
+        self.activateWindow()
+        self.setFocus()
         self._start_fade_in()
 
+    @traced_paint
     def paintEvent(self, event):
         painter = QPainter(self)
+        dirty_rects = event.region().rects()
+        self.paint_events += 1
+        self.painted_pixels += sum(rect.width() * rect.height() for rect in dirty_rects)
+        if self._snapshot is not None:
+            painter.setOpacity(self._fade_value)
+            painter.drawPixmap(0, 0, self._snapshot)
+        else:
+            layer = self._ensure_render_cache()
+            dpr = layer.devicePixelRatio()
+            for rect in dirty_rects:
+                source = QRect(
+                    int(rect.x() * dpr),
+                    int(rect.y() * dpr),
+                    int(rect.width() * dpr),
+                    int(rect.height() * dpr),
+                )
+                painter.drawPixmap(rect, layer, source)
+            self.windows.paint(painter, event.region())
+        if self._open_started_at is not None:
+            now = time.perf_counter()
+            elapsed_ms = (now - self._open_started_at) * 1000.0
+            TRACER.complete("hotkey_to_first_frame", self._open_started_at, now, category="latency")
+            self._open_started_at = None
+            if self._app_controller is not None:
+                self._app_controller.record_open_latency(elapsed_ms)
+
+    def _invalidate_render_cache(self):
+        self._static_layer = None
+
+    def reload_assets(self):
+        self._banner_size = ASSETS.source_size("banner.png")
+        self._invalidate_render_cache()
+        self.settings_button.update()
+        self.update()
+
+    def _scaled_banner(self, dpr):
+        if self._banner_size.isEmpty():
+            return None
+        target_width = int(self.width() * 0.13)
+        aspect_ratio = self._banner_size.width() / self._banner_size.height()
+        target_height = int(target_width / aspect_ratio)
+        return ASSETS.pixmap("banner.png", (target_width, target_height), dpr, aspect_mode=Qt.IgnoreAspectRatio)
+
+    def _prepared_instruction_text(self):
+        if self._instruction_static is None:
+            static_text = QStaticText(self._instruction_text)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), self._instruction_font)
+            self._instruction_static = static_text
+        return self._instruction_static
+
+    def _ensure_render_cache(self):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self._static_layer is not None and self._render_cache_key == key:
+            return self._static_layer
+        if self._render_cache_key is not None and self._render_cache_key[2] != dpr:
+            for window in list(self.windows.windows):
+                self.windows.invalidate_content(window.app_id)
+        layer = QPixmap(max(1, int(self.width() * dpr)), max(1, int(self.height() * dpr)))
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.transparent)
+        painter = QPainter(layer)
+        self._paint_static_layer(painter, self.rect(), dpr)
+        painter.end()
+        self._static_layer = layer
+        self._render_cache_key = key
+        return layer
+
+    def _paint_static_layer(self, painter, rect, dpr):
         painter.setRenderHint(QPainter.Antialiasing, False)
-        painter.fillRect(self.rect(), QColor(23, 22, 22, 204))
-        if self._instruction_text:
-            font = QFont("Segoe UI", 12)
-            painter.setFont(font)
+        painter.setClipRect(rect)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(rect, QColor(*OVERLAY_BACKGROUND_RGBA))
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        text_rect = self._instruction_rect()
+        if self._instruction_text and text_rect.intersects(rect):
+            painter.setFont(self._instruction_font)
             painter.setPen(QColor("#FFFFFF"))
-            metrics = painter.fontMetrics()
-            text_width = metrics.horizontalAdvance(self._instruction_text)
-            text_x = (self.width() - text_width) // 2
-            text_y = metrics.ascent() + 5
-            painter.drawText(text_x, text_y, self._instruction_text)
-        if not self.banner.isNull():
-            target_width = int(self.width() * 0.13)
-            aspect_ratio = self.banner.width() / self.banner.height()
-            target_height = int(target_width / aspect_ratio)
-            x = (self.width() - target_width) // 2
+            painter.drawStaticText(text_rect.x(), OVERLAY_TEXT_TOP, self._prepared_instruction_text())
+        banner = self._scaled_banner(dpr)
+        if banner is not None:
+            x = (self.width() - int(self.width() * 0.13)) // 2
             y = int(self.height() * 0.03)
-            painter.drawPixmap(x, y, target_width, target_height, self.banner)
+            if QRect(x, y, int(banner.width() / dpr), int(banner.height() / dpr)).intersects(rect):
+                painter.drawPixmap(x, y, banner)
+
+    def _instruction_rect(self):
+        if not self._instruction_text:
+            return QRect()
+        text_width = self._instruction_metrics.horizontalAdvance(self._instruction_text)
+        text_x = (self.width() - text_width) // 2
+        return QRect(text_x, OVERLAY_TEXT_TOP, text_width, self._instruction_metrics.height())
+
+    def _repaint_layer_region(self, rect):
+        if self._static_layer is None:
+            return
+        painter = QPainter(self._static_layer)
+        self._paint_static_layer(painter, rect, self._static_layer.devicePixelRatio())
+        painter.end()
+
+    def reset_paint_stats(self):
+        self.paint_events = 0
+        self.painted_pixels = 0
 
     def resizeEvent(self, event):
+        self._invalidate_render_cache()
         self._position_button()
         super().resizeEvent(event)
 
@@ -460,8 +3535,12 @@ class Overlay(QWidget):
         self.settings_button.move(btn_x, btn_y)
 
     def _update_instruction_text(self):
+        old_rect = self._instruction_rect()
         self._instruction_text = f"Press {self._hotkey_name} or ESC to minimise NANOverlay"
-        self.update()
+        self._instruction_static = None
+        dirty = old_rect.united(self._instruction_rect()).adjusted(-2, -2, 2, 2)
+        self._repaint_layer_region(dirty)
+        self.update(dirty)
 
     def _handle_settings_button(self):
         if self.settings_panel.isVisible():
@@ -470,8 +3549,14 @@ class Overlay(QWidget):
         if self._app_controller is not None:
             self._app_controller.set_panel_open_state(True)
 
+    def _refresh_usage_table(self):
+        if self.settings_panel.isVisible():
+            self.settings_panel.set_usage_rows(self._app_controller.resource_monitor.rows())
+
     def _show_settings_panel(self):
         self._center_settings_panel()
+        if self._app_controller is not None:
+            self.settings_panel.set_usage_rows(self._app_controller.resource_monitor.rows())
         self.settings_panel.show()
         self.settings_panel.raise_()
         self.settings_button.lock_state("pressed")
@@ -493,8 +3578,16 @@ class Overlay(QWidget):
     def _center_settings_panel(self):
         x = (self.width() - self.settings_panel.width()) // 2
         y = (self.height() - self.settings_panel.height()) // 2
+        if self._app_controller is not None:
+            stored = self._app_controller.settings.get_point(SETTINGS_PANEL_POS_KEY)
+            if stored is not None and self.rect().contains(stored):
+                x, y = stored.x(), stored.y()
         self.settings_panel.move(x, y)
 
+    def _on_settings_panel_moved(self, pos):
+        if self._app_controller is not None:
+            self._app_controller.settings.set(SETTINGS_PANEL_POS_KEY, pos)
+
     def set_hotkey_name(self, key_name):
         if key_name == self._hotkey_name:
             return
@@ -508,6 +3601,28 @@ class Overlay(QWidget):
         else:
             super().keyPressEvent(event)
 
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.windows.press(event.pos()):
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.windows.drag_to(event.pos()):
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self.windows.release():
+            return
+        super().mouseReleaseEvent(event)
+
+    def _on_app_content_invalidated(self, app_id):
+        self._app_controller.content_renderer.invalidate(app_id, self.devicePixelRatioF())
+
+    def _on_app_window_moved(self, app_id, pos):
+        if self._app_controller is not None and self._app_controller.settings is not None:
+            self._app_controller.settings.set_app_setting(app_id, "window_pos", pos)
+
     def closeEvent(self, event):
         if not self._skip_fade:
             if not self._is_fading_out:
@@ -516,29 +3631,99 @@ class Overlay(QWidget):
                 self._start_fade_out()
                 return
         self._skip_fade = False
+        self._is_fading_out = False
+        self._fade_anim.stop()
+        self._end_snapshot()
         if self._app_controller is not None:
             self._app_controller.set_panel_open_state(self.settings_panel.isVisible())
         self.releaseKeyboard()
-        QApplication.restoreOverrideCursor()
+        if self._override_cursor_set:
+            QApplication.restoreOverrideCursor()
+            self._override_cursor_set = False
         if self._app_controller is not None:
             self._app_controller.set_hotkey_capture(False)
-        self.deleteLater()
+        self._open_started_at = None
+        if self._app_controller is not None:
+            self._app_controller.overlay_hidden()
+        if not self._resident:
+            self.deleteLater()
         super().closeEvent(event)
 
-    def _start_fade_in(self):
+    def _start_fade_in(self, start_value=0.0):
         self._is_fading_out = False
-        self._fade_anim.stop()
-        self._fade_anim.setStartValue(0.0)
-        self._fade_anim.setEndValue(1.0)
-        self._fade_anim.start()
+        self._begin_fade(start_value, 1.0)
 
     def _start_fade_out(self):
+        self._begin_fade(self._fade_value, 0.0)
+
+    def _begin_fade(self, start_value, end_value):
         self._fade_anim.stop()
-        self._fade_anim.setStartValue(self.windowOpacity())
-        self._fade_anim.setEndValue(0.0)
+        strategy = "opacity"
+        if self._app_controller is not None:
+            strategy = self._app_controller.fade_selector.strategy
+        if strategy != self._fade_strategy:
+            self._end_snapshot()
+            self._fade_strategy = strategy
+        self._fade_frame_times = []
+        self._last_fade_tick = None
+        if strategy == "instant":
+            self._apply_fade_value(end_value)
+            QTimer.singleShot(0, self._on_fade_finished)
+            return
+        if strategy == "snapshot":
+            self._begin_snapshot()
+        self._fade_anim.setStartValue(float(start_value))
+        self._fade_anim.setEndValue(float(end_value))
         self._fade_anim.start()
 
+    def _apply_fade_value(self, value):
+        now = time.perf_counter()
+        if self._last_fade_tick is not None:
+            self._fade_frame_times.append((now - self._last_fade_tick) * 1000.0)
+        self._last_fade_tick = now
+        self._fade_value = value
+        if self._fade_strategy == "snapshot":
+            if self.windowOpacity() != 1.0:
+                self.setWindowOpacity(1.0)
+            self.update()
+        elif self._fade_strategy == "reduced":
+            steps = FADE_REDUCED_STEPS
+            if self._app_controller is not None:
+                steps = self._app_controller.fade_reduced_steps
+            stepped = round(value * steps) / steps
+            if stepped != self.windowOpacity():
+                self.setWindowOpacity(stepped)
+        else:
+            self.setWindowOpacity(value)
+
+    def _begin_snapshot(self):
+        if self._snapshot is not None:
+            return
+        self._snapshot = self.grab()
+        self._snapshot_hidden_children = [
+            child for child in (self.settings_button, self.settings_panel) if child.isVisible()
+        ]
+        for child in self._snapshot_hidden_children:
+            child.hide()
+
+    def _end_snapshot(self):
+        if self._snapshot is None:
+            return
+        self._snapshot = None
+        for child in self._snapshot_hidden_children:
+            child.show()
+        self._snapshot_hidden_children = []
+        self.update()
+
     def _on_fade_finished(self):
+        if self._app_controller is not None and self._fade_frame_times:
+            self._app_controller.record_fade_frames(self._fade_strategy, self._fade_frame_times)
+        self._fade_frame_times = []
+        if not self._is_fading_out:
+            self._end_snapshot()
+        if self._fade_in_started_at is not None and not self._is_fading_out:
+            TRACER.complete("hotkey_to_fade_in_end", self._fade_in_started_at, category="latency")
+            self._fade_in_started_at = None
         if self._is_fading_out:
             self._is_fading_out = False
             self._skip_fade = True
@@ -552,65 +3737,654 @@ class Overlay(QWidget):
         if self._app_controller is not None:
             self._app_controller.set_hotkey_capture(False)
 
+class ControlServer(QObject):
+    def __init__(self, app_controller, name=None, parent=None):
+        super().__init__(parent)
+        self._app_controller = app_controller
+        from PyQt5.QtNetwork import QLocalServer
+        self.name = name or control_socket_path()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._accept)
+        self._buffers = {}
+        self.commands_handled = 0
+
+    def listen(self):
+        if self._server.listen(self.name):
+            return True
+        if control_socket_in_use(self.name):
+            return False
+        self._server.removeServer(self.name)
+        return self._server.listen(self.name)
+
+    def close(self):
+        self._server.close()
+
+    def _accept(self):
+        while self._server.hasPendingConnections():
+            connection = self._server.nextPendingConnection()
+            self._buffers[id(connection)] = b""
+            connection.readyRead.connect(lambda connection=connection: self._read(connection))
+            connection.disconnected.connect(lambda connection=connection: self._drop(connection))
+
+    def _drop(self, connection):
+        self._buffers.pop(id(connection), None)
+        connection.deleteLater()
+
+    def _read(self, connection):
+        buffer = self._buffers.get(id(connection), b"") + bytes(connection.readAll())
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            reply = self.handle_line(line)
+            connection.write((json.dumps(reply) + "\n").encode("utf-8"))
+        connection.flush()
+        self._buffers[id(connection)] = buffer
+
+    def handle_line(self, line):
+        try:
+            request = json.loads(line.decode("utf-8"))
+            command = request.get("command")
+            args = request.get("args") or []
+        except (ValueError, AttributeError, UnicodeDecodeError):
+            return {"ok": False, "error": "malformed request"}
+        if not isinstance(command, str) or not isinstance(args, list):
+            return {"ok": False, "error": "malformed request"}
+        try:
+            result = self.execute(command, [str(arg) for arg in args])
+        except ValueError as exc:
+            return {"ok": False, "error": str(exc)}
+        except Exception as exc:
+            return {"ok": False, "error": f"{command} failed: {exc!r}"}
+        self.commands_handled += 1
+        return {"ok": True, "result": result}
+
+    def execute(self, command, args):
+        controller = self._app_controller
+        if command == "ping":
+            return {"pid": os.getpid(), "hotkey": controller.hotkey_name}
+        if command == "toggle":
+            controller.request_toggle.emit()
+            return None
+        if command == "close":
+            controller.request_close.emit()
+            return None
+        if command == "set-hotkey":
+            normalized = normalize_hotkey_name(args[0]) if args else None
+            if normalized is None:
+                raise ValueError("set-hotkey expects a valid key name")
+            controller.apply_hotkey_change(normalized)
+            return normalized
+        if command == "open-app":
+            if not args:
+                raise ValueError("open-app expects an app id")
+            entry = controller.open_app(args[0])
+            if entry is None:
+                raise ValueError(f"unknown app: {args[0]}")
+            return entry.app_id
+        if command == "reload-apps":
+            return controller.reload_apps()
+        if command == "usage":
+            return controller.resource_monitor.rows()
+        if command == "resume-app":
+            if not args:
+                raise ValueError("resume-app expects an app id")
+            entry = controller.resume_app(args[0])
+            if entry is None:
+                raise ValueError(f"unknown app: {args[0]}")
+            return entry.app_id
+        if command == "stalls":
+            return controller.watchdog.stats() if controller.watchdog is not None else None
+        if command == "quit":
+            QTimer.singleShot(0, controller.quit)
+            return None
+        raise ValueError(f"unknown command: {command}")
+
+
 class AppWithGlobalKeyHandler(QApplication):
     request_toggle = pyqtSignal()
     request_close = pyqtSignal()
+    app_ui_command = pyqtSignal(str, str, object)
+    app_error = pyqtSignal(str, str)
+    app_hotkey = pyqtSignal(str, str)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.startup_timings = {}
+        self.mark_startup("app_ready")
         self.overlay = None
-        self.hotkey_name = load_hotkey_from_file()
+        self.settings = None
+        self.hotkey_name = DEFAULT_TRIGGER_KEY
         self.panel_open = False
+        self.worker_pool = None
+        self.control_server = None
+        self.tick_scheduler = TickScheduler(parent=self)
+        self.async_bridge = AsyncBridge(parent=self)
+        self.watchdog = None
+        self.frame_sources = {}
+        self.app_coroutines = {}
+        self.app_hosts = {}
+        self.content_renderer = AppContentRenderer(self.tick_scheduler, parent=self)
+        self.resource_monitor = AppResourceMonitor(self, parent=self)
+        self.tick_scheduler.accounting = self.resource_monitor.charge_callback
+        self.content_renderer.accounting = self.resource_monitor.charge_cpu
+        self.app_reloader = None
+        self.reload_timings = deque(maxlen=TRACE_SAMPLE_WINDOW)
+        self.tray_icon = None
+        self.app_registry = AppRegistry()
+        self.hotkeys = None
+        self.input_backend = None
+        self.input_scheduler = None
+        self.fade_selector = FadeModeSelector()
+        self.fade_reduced_steps = FADE_REDUCED_STEPS
         self._suspend_hotkey_listener = False
-        self.listener = keyboard.Listener(on_press=self.on_key_press)
-        self.listener.start()
+        self._hotkey_pressed_at = None
+        self._idle_phase_done = False
+        self.last_open_latency_ms = None
+        self.open_latency_misses = 0
+        self.aboutToQuit.connect(self._shutdown_workers)
+        self.aboutToQuit.connect(self._export_trace)
+        self.aboutToQuit.connect(self.async_bridge.stop)
+        self.aboutToQuit.connect(self.content_renderer.shutdown)
+        if WATCHDOG_ENABLED:
+            self.watchdog = StallWatchdog(app_resolver=self._app_id_for_dir, parent=self)
+            self.aboutToQuit.connect(self.watchdog.stop)
         self.request_toggle.connect(self.toggle_overlay, Qt.QueuedConnection)
         self.request_close.connect(self._close_overlay, Qt.QueuedConnection)
+        self.app_hotkey.connect(self._dispatch_app_hotkey, Qt.QueuedConnection)
+        QTimer.singleShot(STARTUP_INPUT_DELAY_MS, self._start_input_phase)
+        QTimer.singleShot(OVERLAY_PREWARM_DELAY_MS, self._start_idle_phase)
+
+    def start_control_server(self, name=None):
+        self.control_server = ControlServer(self, name, parent=self)
+        if not self.control_server.listen():
+            self.control_server = None
+            return False
+        self.aboutToQuit.connect(self.control_server.close)
+        return True
+
+    def mark_startup(self, phase):
+        if phase not in self.startup_timings:
+            self.startup_timings[phase] = (time.perf_counter() - PROCESS_STARTED_AT) * 1000.0
+            TRACER.instant(f"startup.{phase}")
+
+    def _start_input_phase(self):
+        if self.settings is not None:
+            return
+        self.settings = SettingsStore(parent=self)
+        self.settings.changed.connect(self._on_settings_changed)
+        self.aboutToQuit.connect(self.settings.close)
+        self.hotkey_name = self._load_hotkey_setting()
+        self.mark_startup("settings_ready")
+        self.fade_selector = self._build_fade_selector()
+        self.fade_reduced_steps = max(1, self.settings.get_int("fade_reduced_steps", FADE_REDUCED_STEPS))
+        self.resource_monitor.configure(self.settings)
+        self.input_scheduler = InputEventScheduler(
+            self.settings.get_bool("hotkey_suppress_autorepeat", HOTKEY_SUPPRESS_AUTOREPEAT),
+            self.settings.get_int("hotkey_min_toggle_interval_ms", HOTKEY_MIN_TOGGLE_INTERVAL_MS),
+        )
+        self.input_backend = create_input_backend(self.settings.get("input_backend", DEFAULT_INPUT_BACKEND))
+        self.hotkeys = HotkeyRegistry(self.input_scheduler, self.input_backend)
+        self.hotkeys.register(TOGGLE_BINDING_ID, self.hotkey_name, self._on_toggle_hotkey)
+        self.input_backend.start(self.on_key_press, self.on_key_release)
+        self.aboutToQuit.connect(self.input_backend.stop)
+        self.mark_startup("hotkey_ready")
+
+    def _start_idle_phase(self):
+        if self._idle_phase_done:
+            return
+        self._start_input_phase()
+        self._idle_phase_done = True
+        self.app_registry.scan()
+        self.app_registry.load_startup_apps(self._start_app)
+        self._register_app_hotkeys()
+        if HOT_RELOAD_ENABLED:
+            self.start_hot_reload()
+        QTimer.singleShot(0, self._preload_assets)
+        if RESIDENT_OVERLAY:
+            self._prewarm_overlay()
+        self.mark_startup("idle_ready")
+
+    def _preload_assets(self):
+        screen = self.primaryScreen()
+        dpr = screen.devicePixelRatio() if screen is not None else 1.0
+        ASSETS.preload(dpr=dpr)
+        for entry in self.app_registry.apps.values():
+            if manifest_bool(entry.manifest, "custom_button_icon", False):
+                ASSETS.image(APP_BUTTON_ICON_NAME, base_dir=entry.app_dir)
 
     def on_key_press(self, key):
         if self._suspend_hotkey_listener:
             return
         try:
-            if pynput_key_matches_hotkey(key, self.hotkey_name):
-                self.request_toggle.emit()
+            self.hotkeys.on_press(key)
         except Exception:
             pass
 
-    def toggle_overlay(self):
-        if self.overlay is None or not self.overlay.isVisible():
+    def on_key_release(self, key):
+        try:
+            self.hotkeys.on_release(key)
+        except Exception:
+            pass
+
+    def _on_toggle_hotkey(self):
+        if not self.input_scheduler.submit_toggle():
+            return
+        self._hotkey_pressed_at = time.perf_counter()
+        TRACER.instant("hotkey.press")
+        self.request_toggle.emit()
+
+    def _register_app_hotkeys(self):
+        self.hotkeys.unregister_prefix("app:")
+        for entry in self.app_registry.apps.values():
+            for name, hotkey_name in entry.hotkeys.items():
+                self.hotkeys.register(
+                    f"app:{entry.app_id}:{name}",
+                    hotkey_name,
+                    lambda app_id=entry.app_id, name=name: self.app_hotkey.emit(app_id, name),
+                )
+
+    def _dispatch_app_hotkey(self, app_id, name):
+        if self.send_app_event(app_id, "hotkey", name):
+            return
+        entry = self.open_app(app_id)
+        if entry is not None and entry.module is not None:
+            try:
+                _call_app_hook(entry.module, "on_hotkey", name)
+            except Exception:
+                pass
+
+    def _ensure_overlay(self):
+        self._start_input_phase()
+        if self.overlay is None:
+            start = time.perf_counter()
             self.overlay = Overlay(self, self.hotkey_name, self.panel_open)
             self.overlay.destroyed.connect(self._clear_overlay)
-        else:
+            TRACER.complete("Overlay.__init__", start)
+            for entry in self.app_registry.apps.values():
+                if entry.loaded or (self.worker_pool is not None and self.worker_pool.is_hosted(entry.app_id)):
+                    self._open_app_window(entry)
+        return self.overlay
+
+    def _prewarm_overlay(self):
+        self._ensure_overlay()._ensure_render_cache()
+
+    def toggle_overlay(self):
+        self._start_input_phase()
+        self.input_scheduler.toggle_consumed()
+        started_at = self._hotkey_pressed_at
+        self._hotkey_pressed_at = None
+        if started_at is not None:
+            TRACER.complete("hotkey_to_toggle", started_at, category="latency")
+            self.input_backend.toggle_latency.add((time.perf_counter() - started_at) * 1000.0)
+        if self.overlay is not None and self.overlay.is_open():
             self.overlay.close()
-            self.overlay = None
+            return
+        overlay = self._ensure_overlay()
+        overlay.open_overlay(self.hotkey_name, self.panel_open, started_at)
+
+    def record_open_latency(self, elapsed_ms):
+        self.last_open_latency_ms = elapsed_ms
+        if elapsed_ms > OVERLAY_OPEN_TARGET_MS:
+            self.open_latency_misses += 1
 
     def _clear_overlay(self, *args):
         self.overlay = None
 
     def _close_overlay(self):
-        if self.overlay is not None:
+        if self.overlay is not None and self.overlay.is_open():
             self.overlay.close()
 
-    def apply_hotkey_change(self, key_name):
-        normalized = save_hotkey_to_file(key_name)
+    def _load_hotkey_setting(self):
+        value = normalize_hotkey_name(self.settings.get(SETTINGS_HOTKEY_KEY))
+        if value is None:
+            value = DEFAULT_TRIGGER_KEY
+            self.settings.set(SETTINGS_HOTKEY_KEY, value)
+        return value
+
+    def _build_fade_selector(self):
+        return FadeModeSelector(
+            self.settings.get("fade_mode", "auto"),
+            self.settings.get_float("fade_frame_budget_ms", FADE_FRAME_BUDGET_MS),
+            resolved=self.settings.get("fade_mode_resolved"),
+        )
+
+    def record_fade_frames(self, strategy, frame_times_ms):
+        if self.fade_selector.record(strategy, frame_times_ms) and self.fade_selector.settled:
+            if self.fade_selector.mode == "auto":
+                self.settings.set("fade_mode_resolved", self.fade_selector.strategy)
+
+    def _on_settings_changed(self, keys):
+        if keys & {"fade_mode", "fade_frame_budget_ms"}:
+            self.settings.remove("fade_mode_resolved")
+            self.fade_selector = self._build_fade_selector()
+        if "fade_reduced_steps" in keys:
+            self.fade_reduced_steps = max(1, self.settings.get_int("fade_reduced_steps", FADE_REDUCED_STEPS))
+        if any(key.startswith("app_budget_") for key in keys):
+            self.resource_monitor.configure(self.settings)
+        if SETTINGS_HOTKEY_KEY in keys:
+            self.apply_hotkey_change(self._load_hotkey_setting(), persist=False)
+        if "hotkey_suppress_autorepeat" in keys:
+            self.input_scheduler.suppress_autorepeat = self.settings.get_bool(
+                "hotkey_suppress_autorepeat", HOTKEY_SUPPRESS_AUTOREPEAT
+            )
+        if "hotkey_min_toggle_interval_ms" in keys:
+            self.input_scheduler.min_toggle_interval = self.settings.get_int(
+                "hotkey_min_toggle_interval_ms", HOTKEY_MIN_TOGGLE_INTERVAL_MS
+            ) / 1000.0
+
+    def apply_hotkey_change(self, key_name, persist=True):
+        normalized = normalize_hotkey_name(key_name) or DEFAULT_TRIGGER_KEY
+        if persist:
+            self.settings.set(SETTINGS_HOTKEY_KEY, normalized)
         if normalized == self.hotkey_name:
             return
         self.hotkey_name = normalized
+        self.hotkeys.register(TOGGLE_BINDING_ID, normalized, self._on_toggle_hotkey)
         if self.overlay is not None:
             self.overlay.set_hotkey_name(normalized)
 
+    def _ensure_worker_pool(self):
+        if self.worker_pool is None:
+            self.worker_pool = AppWorkerPool(parent=self)
+            self.worker_pool.ui_command.connect(self.app_ui_command)
+            self.worker_pool.ui_command.connect(self._on_app_ui_command)
+            self.worker_pool.app_error.connect(self.app_error)
+            self.worker_pool.app_failed.connect(self.app_error)
+            self.worker_pool.app_failed.connect(self._on_app_failed)
+        return self.worker_pool
+
+    def overlay_shown(self):
+        self.tick_scheduler.resume()
+        self.resource_monitor.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+
+    def overlay_hidden(self):
+        self.tick_scheduler.suspend()
+        self.resource_monitor.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+
+    def _start_app(self, entry):
+        if self.overlay is not None and self.overlay.isVisible():
+            self.resource_monitor.start()
+        if entry.execution == "inprocess":
+            module = entry.load()
+            if module is not None and entry.app_id not in self.app_hosts:
+                host = self.app_hosts[entry.app_id] = InProcessAppHost(entry.app_id, module, self)
+                try:
+                    _call_app_hook(module, "start", host)
+                except Exception:
+                    pass
+            self._register_app_tick(entry)
+            self._start_app_coroutine(entry)
+        else:
+            self._ensure_worker_pool().host(entry)
+            module = None
+        self._open_app_window(entry)
+        return module
+
+    def _start_app_coroutine(self, entry):
+        future = self.app_coroutines.get(entry.app_id)
+        if future is not None and not future.done():
+            return future
+        run = getattr(entry.module, "run", None) if entry.module is not None else None
+        if not callable(run):
+            return None
+        import inspect
+        if not inspect.iscoroutinefunction(run):
+            return None
+        future = self.app_coroutines[entry.app_id] = self.async_bridge.submit(run(self.async_bridge))
+        return future
+
+    def _cancel_app_coroutine(self, app_id):
+        future = self.app_coroutines.pop(app_id, None)
+        if future is not None:
+            future.cancel()
+
+    def _register_app_tick(self, entry):
+        tick = getattr(entry.module, "tick", None) if entry.module is not None else None
+        if not callable(tick):
+            return None
+        self.tick_scheduler.unregister_owner(entry.app_id)
+        return self.tick_scheduler.register(
+            tick,
+            rate_hz=manifest_int(entry.manifest, "tick_rate", TICK_DEFAULT_RATE_HZ),
+            priority=manifest_int(entry.manifest, "tick_priority", 0),
+            owner=entry.app_id,
+        )
+
+    def _open_app_window(self, entry):
+        if not entry.has_window:
+            return None
+        overlay = self._ensure_overlay()
+        renderer = getattr(entry.module, "render", None) if entry.module is not None else None
+        position = self.settings.get_point(f"app.{entry.app_id}.window_pos")
+        window = overlay.windows.open_window(entry, renderer if callable(renderer) else None, position)
+        channel = getattr(entry.module, "frame_channel", None) if entry.module is not None else None
+        if channel is not None:
+            from framechannel import FrameChannel
+            if isinstance(channel, FrameChannel):
+                self.attach_frame_channel(entry.app_id, channel)
+        window.frame_source = self.frame_sources.get(entry.app_id)
+        if callable(getattr(entry.module, "render_frame", None)):
+            self.content_renderer.attach(entry, window, overlay.devicePixelRatioF())
+        return window
+
+    def _on_app_ui_command(self, app_id, command, payload):
+        if command == "frame_channel" and payload:
+            self.attach_frame_channel(app_id, payload.get("name") if isinstance(payload, dict) else payload)
+        elif command == "invalidate":
+            self.invalidate_app(app_id)
+
+    def invalidate_app(self, app_id):
+        if self.overlay is not None and self.overlay.windows.get(app_id) is not None:
+            self.overlay.windows.invalidate_content(app_id)
+        else:
+            self.content_renderer.invalidate(app_id)
+
+    def attach_frame_channel(self, app_id, channel):
+        source = self.frame_sources.get(app_id)
+        if source is not None and (source.channel is channel or source.channel.name == getattr(channel, "name", channel)):
+            return source
+        self.detach_frame_channel(app_id)
+        from framechannel import FrameChannel
+        try:
+            if not isinstance(channel, FrameChannel):
+                channel = FrameChannel.attach(channel)
+        except (OSError, ValueError):
+            return None
+        source = self.frame_sources[app_id] = FrameChannelSource(channel)
+        entry = self.app_registry.get(app_id)
+        rate_hz = manifest_int(entry.manifest, "frame_rate", APP_FRAME_RATE_HZ) if entry is not None else APP_FRAME_RATE_HZ
+        self.tick_scheduler.register(
+            lambda dt, app_id=app_id: self._poll_frame_source(app_id),
+            rate_hz=rate_hz,
+            priority=1,
+            owner=f"frames:{app_id}",
+        )
+        if self.overlay is not None:
+            window = self.overlay.windows.get(app_id)
+            if window is not None:
+                window.frame_source = source
+        return source
+
+    def detach_frame_channel(self, app_id):
+        source = self.frame_sources.pop(app_id, None)
+        if source is None:
+            return
+        self.tick_scheduler.unregister_owner(f"frames:{app_id}")
+        if self.overlay is not None:
+            window = self.overlay.windows.get(app_id)
+            if window is not None:
+                window.frame_source = None
+        source.close()
+
+    def _poll_frame_source(self, app_id):
+        source = self.frame_sources.get(app_id)
+        if source is not None and source.poll() and self.overlay is not None:
+            self.overlay.windows.invalidate_frame(app_id)
+
+    def _export_trace(self):
+        if TRACER.enabled and TRACER.events:
+            try:
+                TRACER.export_chrome_trace()
+            except OSError:
+                pass
+
+    def _app_id_for_dir(self, dir_name):
+        for entry in list(self.app_registry.apps.values()):
+            if entry.app_dir.name == dir_name:
+                return entry.app_id
+        return None
+
+    def _shutdown_workers(self):
+        for app_id in list(self.app_hosts):
+            entry = self.app_registry.get(app_id)
+            if entry is not None:
+                self._stop_app(entry)
+        for app_id in list(self.frame_sources):
+            self.detach_frame_channel(app_id)
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+
+    def open_app(self, app_id):
+        self._start_idle_phase()
+        return self.app_registry.open_app(app_id, self._start_app)
+
+    def reload_apps(self):
+        self._start_idle_phase()
+        apps = self.app_registry.scan()
+        self.app_registry.load_startup_apps(self._start_unsuspended_app)
+        self._register_app_hotkeys()
+        return sorted(apps)
+
+    def _start_unsuspended_app(self, entry):
+        if self.resource_monitor.is_suspended(entry.app_id):
+            return None
+        if self.worker_pool is not None and self.worker_pool.has_failed(entry.app_id):
+            return None
+        return self._start_app(entry)
+
+    def _on_app_failed(self, app_id, reason):
+        usage = self.resource_monitor.usage(app_id)
+        usage.status = "failed"
+        usage.reason = reason
+
+    def start_hot_reload(self):
+        if self.app_reloader is not None:
+            return self.app_reloader
+        self.app_reloader = AppReloader(
+            known_paths=lambda: [entry.app_dir for entry in self.app_registry.apps.values()], parent=self
+        )
+        self.app_reloader.apps_changed.connect(self.reload_app_paths)
+        self.app_reloader.assets_changed.connect(self.reload_assets)
+        self.app_reloader.start()
+        self.aboutToQuit.connect(self.app_reloader.stop)
+        return self.app_reloader
+
+    def reload_app_paths(self, paths):
+        reloaded = [self.reload_app(path) for path in paths]
+        self._register_app_hotkeys()
+        return reloaded
+
+    def _stop_app(self, entry):
+        self._cancel_app_coroutine(entry.app_id)
+        host = self.app_hosts.pop(entry.app_id, None)
+        if host is not None:
+            try:
+                _call_app_hook(host.module, "stop", host)
+            except Exception:
+                pass
+        self.tick_scheduler.unregister_owner(entry.app_id)
+        self.content_renderer.detach(entry.app_id)
+        self.detach_frame_channel(entry.app_id)
+        if self.worker_pool is not None and self.worker_pool.is_hosted(entry.app_id):
+            self.worker_pool.unhost(entry.app_id)
+
+    def throttle_app(self, app_id, factor):
+        for owner in (app_id, f"render:{app_id}", f"frames:{app_id}"):
+            self.tick_scheduler.scale_owner(owner, factor)
+
+    def suspend_app(self, app_id):
+        entry = self.app_registry.get(app_id)
+        if entry is not None:
+            self._stop_app(entry)
+
+    def resume_app(self, app_id):
+        entry = self.app_registry.get(app_id)
+        if entry is None:
+            return None
+        self._stop_app(entry)
+        self.resource_monitor.reset(app_id)
+        self._start_app(entry)
+        return entry
+
+    def reload_app(self, app_path):
+        started_at = time.perf_counter()
+        app_path = Path(app_path)
+        old = self.app_registry.entry_for_path(app_path)
+        new = self.app_registry.read_entry(app_path) if app_path.exists() else None
+        running = old is not None and (
+            old.loaded or (self.worker_pool is not None and self.worker_pool.is_hosted(old.app_id))
+        )
+        state = None
+        if old is not None:
+            get_state = getattr(old.module, "get_state", None) if old.module is not None else None
+            if callable(get_state):
+                try:
+                    state = get_state()
+                except Exception:
+                    state = None
+            self._stop_app(old)
+            self.app_registry.apps.pop(old.app_id, None)
+            if self.overlay is not None and (new is None or new.app_id != old.app_id):
+                self.overlay.windows.close_window(old.app_id)
+        if is_app_bundle(app_path):
+            close_app_bundle(app_path)
+        ASSETS.invalidate(APP_BUTTON_ICON_NAME, base_dir=app_path)
+        if new is not None:
+            self.app_registry.apps[new.app_id] = new
+            self.resource_monitor.reset(new.app_id)
+            if running or new.start_at_launch:
+                self._start_app(new)
+                restore_state = getattr(new.module, "restore_state", None) if new.module is not None else None
+                if state is not None and callable(restore_state):
+                    try:
+                        restore_state(state)
+                    except Exception:
+                        pass
+        app_id = new.app_id if new is not None else (old.app_id if old is not None else app_path.name)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000.0
+        self.reload_timings.append({"app_id": app_id, "ms": elapsed_ms, "removed": new is None})
+        TRACER.complete(f"reload.{app_id}", started_at, category="reload")
+        return new
+
+    def reload_assets(self, names):
+        if None in names:
+            ASSETS.invalidate()
+        else:
+            for name in names:
+                ASSETS.invalidate(name)
+        if self.overlay is not None:
+            self.overlay.reload_assets()
+        if self.tray_icon is not None and (None in names or "tray.png" in names):
+            self.tray_icon.setIcon(ASSETS.icon("tray.png"))
+
+    def send_app_event(self, app_id, name, payload=None):
+        if self.worker_pool is None or not self.worker_pool.is_hosted(app_id):
+            return False
+        return self.worker_pool.send_event(app_id, name, payload)
+
     def set_hotkey_capture(self, active):
         self._suspend_hotkey_listener = active
 
     def set_panel_open_state(self, is_open):
         self.panel_open = bool(is_open)
 
-def main():
-    app = AppWithGlobalKeyHandler(sys.argv)
-    app.setQuitOnLastWindowClosed(False)
-
-    tray_icon = QSystemTrayIcon()
-    tray_icon.setIcon(QIcon("ressources/tray.png"))
+def create_tray_icon(app):
+    tray_icon = QSystemTrayIcon(app)
+    tray_icon.setIcon(ASSETS.icon("tray.png"))
     tray_icon.setToolTip("NANOverlay")
 
     menu = QMenu()
@@ -618,7 +4392,21 @@ def main():
     close_action.triggered.connect(app.quit)
 
     tray_icon.setContextMenu(menu)
+    tray_icon._menu = menu
     tray_icon.show()
+    app.tray_icon = tray_icon
+    return tray_icon
+
+
+def main():
+    if send_command("ping") is not None or control_socket_in_use():
+        sys.exit(0)
+    app = AppWithGlobalKeyHandler(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    if not app.start_control_server():
+        sys.exit(0)
+    create_tray_icon(app)
+    app.mark_startup("tray_visible")
 
     sys.exit(app.exec_())
 
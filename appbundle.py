@@ -0,0 +1,172 @@
+import argparse
+import mmap
+import os
+import shutil
+import sys
+import zipfile
+from pathlib import Path
+
+APP_BUNDLE_SUFFIX = ".novapp"
+BUNDLE_MANIFEST_NAME = "info.novr"
+BUNDLE_DEFLATED_SUFFIXES = (".py", ".novr", ".novres", ".txt", ".json")
+BUNDLE_SKIPPED_NAMES = ("__pycache__",)
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_NAME_LENGTH_OFFSET = 26
+
+_open_bundles = {}
+
+
+def is_app_bundle(path):
+    return Path(path).suffix == APP_BUNDLE_SUFFIX
+
+
+class AppBundle:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise
+        try:
+            self._zip = zipfile.ZipFile(self._file)
+        except zipfile.BadZipFile:
+            self._map.close()
+            self._file.close()
+            raise
+        self._members = {info.filename: info for info in self._zip.infolist()}
+        self.stat = os.fstat(self._file.fileno())
+
+    def names(self):
+        return list(self._members)
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def view(self, name):
+        info = self._members[name]
+        if info.compress_type != zipfile.ZIP_STORED:
+            return memoryview(self._zip.read(info))
+        header = info.header_offset
+        name_length = int.from_bytes(
+            self._map[header + LOCAL_HEADER_NAME_LENGTH_OFFSET:header + LOCAL_HEADER_NAME_LENGTH_OFFSET + 2],
+            "little",
+        )
+        extra_length = int.from_bytes(
+            self._map[header + LOCAL_HEADER_NAME_LENGTH_OFFSET + 2:header + LOCAL_HEADER_SIZE], "little"
+        )
+        start = header + LOCAL_HEADER_SIZE + name_length + extra_length
+        return memoryview(self._map)[start:start + info.file_size]
+
+    def read_text(self, name, encoding="utf-8"):
+        return bytes(self.view(name)).decode(encoding)
+
+    def close(self):
+        self._zip.close()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def open_app_bundle(path):
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    cached = _open_bundles.get(path)
+    if cached is not None:
+        if cached.stat.st_mtime_ns == stat.st_mtime_ns and cached.stat.st_size == stat.st_size:
+            return cached
+        close_app_bundle(path)
+    try:
+        bundle = AppBundle(path)
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+    _open_bundles[path] = bundle
+    return bundle
+
+
+def close_app_bundle(path):
+    bundle = _open_bundles.pop(Path(path), None)
+    if bundle is not None:
+        bundle.close()
+
+
+def read_bundle_manifest_text(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.read(BUNDLE_MANIFEST_NAME).decode("utf-8")
+    except zipfile.BadZipFile as exc:
+        raise ValueError(f"{path} is not a valid app bundle") from exc
+
+
+def pack_app(app_dir, output=None, remove_source=False):
+    app_dir = Path(app_dir)
+    if not (app_dir / BUNDLE_MANIFEST_NAME).is_file():
+        raise ValueError(f"{app_dir} has no {BUNDLE_MANIFEST_NAME}")
+    output = Path(output) if output else app_dir.with_name(app_dir.name + APP_BUNDLE_SUFFIX)
+    tmp_path = output.with_name(output.name + ".tmp")
+    with zipfile.ZipFile(tmp_path, "w") as archive:
+        for path in sorted(app_dir.rglob("*")):
+            relative = path.relative_to(app_dir)
+            if not path.is_file() or any(part in BUNDLE_SKIPPED_NAMES for part in relative.parts):
+                continue
+            if path.suffix in BUNDLE_DEFLATED_SUFFIXES:
+                compression = zipfile.ZIP_DEFLATED
+            else:
+                compression = zipfile.ZIP_STORED
+            archive.write(path, relative.as_posix(), compress_type=compression)
+    os.replace(tmp_path, output)
+    if remove_source:
+        shutil.rmtree(app_dir)
+    return output
+
+
+def unpack_app(bundle_path, output=None, remove_source=False):
+    bundle_path = Path(bundle_path)
+    output = Path(output) if output else bundle_path.with_suffix("")
+    close_app_bundle(bundle_path)
+    with zipfile.ZipFile(bundle_path) as archive:
+        if BUNDLE_MANIFEST_NAME not in archive.namelist():
+            raise ValueError(f"{bundle_path} has no {BUNDLE_MANIFEST_NAME}")
+        archive.extractall(output)
+    if remove_source:
+        bundle_path.unlink()
+    return output
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Pack or unpack NANOverlay app bundles.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="pack an app directory into a single bundle")
+    pack.add_argument("source", nargs="+")
+    pack.add_argument("-o", "--output")
+    pack.add_argument("--remove", action="store_true", help="delete the directory after packing")
+    unpack = commands.add_parser("unpack", help="extract a bundle back into a directory")
+    unpack.add_argument("source", nargs="+")
+    unpack.add_argument("-o", "--output")
+    unpack.add_argument("--remove", action="store_true", help="delete the bundle after unpacking")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.output and len(args.source) > 1:
+        print("--output only applies to a single source", file=sys.stderr)
+        return 2
+    action = pack_app if args.command == "pack" else unpack_app
+    for source in args.source:
+        try:
+            print(action(source, args.output, args.remove))
+        except (OSError, ValueError, zipfile.BadZipFile) as exc:
+            print(f"{source}: {exc}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
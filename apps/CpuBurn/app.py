@@ -0,0 +1,31 @@
+import threading
+import time
+
+REPORT_INTERVAL_S = 1.0
+_running = threading.Event()
+
+
+def _burn(host):
+    iterations = 0
+    last_report = time.monotonic()
+    while _running.is_set():
+        sum(index * index for index in range(10000))
+        iterations += 1
+        now = time.monotonic()
+        if now - last_report >= REPORT_INTERVAL_S:
+            host.send("status", {"iterations": iterations})
+            last_report = now
+
+
+def start(host):
+    _running.set()
+    threading.Thread(target=_burn, args=(host,), daemon=True).start()
+
+
+def on_event(host, name, payload):
+    if name == "hang":
+        time.sleep(payload or 10)
+
+
+def stop(host):
+    _running.clear()
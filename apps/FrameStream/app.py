@@ -0,0 +1,65 @@
+import threading
+import time
+
+from framechannel import FrameChannel
+
+BYTES_PER_PIXEL = 4
+BAR_WIDTH = 32
+_running = threading.Event()
+_channel = None
+_thread = None
+
+
+def _row(width, offset):
+    pixels = bytearray(b"\x40\x40\x40\xff" * width)
+    start = offset % width
+    for x in range(start, min(width, start + BAR_WIDTH)):
+        pixels[x * BYTES_PER_PIXEL:(x + 1) * BYTES_PER_PIXEL] = b"\xff\xa0\x20\xff"
+    return bytes(pixels)
+
+
+def stream(channel, width, height, fps, duration=None, stop_event=None):
+    stride = width * BYTES_PER_PIXEL
+    interval = 1.0 / fps if fps else 0.0
+    started_at = time.monotonic()
+    next_frame = started_at
+    frames = 0
+    while stop_event is None or stop_event.is_set():
+        if duration is not None and time.monotonic() - started_at >= duration:
+            break
+        slot, view = channel.begin_frame()
+        view[:stride * height] = _row(width, frames * 4) * height
+        del view
+        channel.commit(slot, width, height, stride)
+        frames += 1
+        if interval:
+            next_frame += interval
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.monotonic()
+    return frames
+
+
+def start(host):
+    global _channel, _thread
+    width, height = 320, 180
+    _channel = FrameChannel.create(width * height * BYTES_PER_PIXEL)
+    _running.set()
+    _thread = threading.Thread(
+        target=stream, args=(_channel, width, height, 30), kwargs={"stop_event": _running}, daemon=True
+    )
+    _thread.start()
+    host.send("frame_channel", {"name": _channel.name})
+
+
+def stop(host):
+    global _channel, _thread
+    _running.clear()
+    if _thread is not None:
+        _thread.join()
+        _thread = None
+    if _channel is not None:
+        _channel.close()
+        _channel = None
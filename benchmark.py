@@ -0,0 +1,892 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROCESS_STARTED_AT = time.perf_counter()
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_SIZES = ((1280, 720), (1920, 1080), (2560, 1440), (3840, 2160))
+DEFAULT_TOGGLES = 200
+DEFAULT_CYCLES = 2000
+DEFAULT_PAINT_FRAMES = 60
+DEFAULT_DRAG_STEPS = 20
+DEFAULT_WINDOW_COUNTS = (1, 20)
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_DELTA = 0.5
+HIGHER_IS_BETTER = (
+    "_fps", ".throughput_mb_s", ".hotkeys_fired", ".restart_to_reload_ratio", ".status_reports"
+)
+PUMP_TIMEOUT_S = 2.0
+DIRTY_REGION_MAX_FRACTION = 0.05
+METRIC_LIMITS = {
+    "dirty.instruction_text.painted_fraction": DIRTY_REGION_MAX_FRACTION,
+    "dirty.settings_button.painted_fraction": DIRTY_REGION_MAX_FRACTION,
+    "dirty.panel_drag.painted_fraction_per_move": DIRTY_REGION_MAX_FRACTION,
+}
+RESULTS_VERSION = 1
+DEFAULT_DISCOVERY_APPS = 200
+FRAME_SIZE = (1920, 1080)
+FRAME_STREAM_SECONDS = 2.0
+FRAME_STREAM_RATES = (0, 60)
+DEFAULT_TYPING_KEYS = 5000
+TYPING_HOTKEY_EVERY = 50
+DEFAULT_IO_CLIENTS = 50
+DEFAULT_IO_ROUND_TRIPS = 40
+IO_PAYLOAD_BYTES = 64 * 1024
+DEFAULT_ISOLATION_TOGGLES = 20
+ISOLATION_FADE_DURATION_MS = 250
+CPU_BURN_APP_ID = "alexvarl.cpuburn"
+
+
+def _prepare_environment():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+    os.environ.setdefault("NANOVERLAY_INPUT_BACKEND", "replay")
+    if "NANOVERLAY_BENCH_DIR" not in os.environ:
+        os.environ["NANOVERLAY_BENCH_DIR"] = tempfile.mkdtemp(prefix="nanoverlay-bench-")
+    work_dir = Path(os.environ["NANOVERLAY_BENCH_DIR"])
+    os.environ.setdefault("NANOVERLAY_SETTINGS_FILE", str(work_dir / "settings.novres"))
+    os.environ.setdefault("NANOVERLAY_APP_INDEX", str(work_dir / "apps_index.json"))
+    os.environ.setdefault("NANOVERLAY_STALL_LOG", str(work_dir / "nanoverlay_stalls.log"))
+    if "NANOVERLAY_APPS_DIR" not in os.environ:
+        import shutil
+        apps_dir = work_dir / "apps"
+        if not apps_dir.exists():
+            shutil.copytree(BASE_DIR / "apps", apps_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        os.environ["NANOVERLAY_APPS_DIR"] = str(apps_dir)
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.chdir(work_dir)
+
+
+def _apps_dir():
+    return Path(os.environ.get("NANOVERLAY_APPS_DIR") or BASE_DIR / "apps")
+
+
+def _import_overlay_module():
+    import NANOverlay
+    return NANOverlay
+
+
+class BenchmarkError(RuntimeError):
+    pass
+
+
+def _pump(app, predicate, timeout_s=PUMP_TIMEOUT_S):
+    from PyQt5.QtCore import QEventLoop
+    deadline = time.perf_counter() + timeout_s
+    while not predicate() and time.perf_counter() < deadline:
+        app.processEvents(QEventLoop.AllEvents, 5)
+    return predicate()
+
+
+def _wait_for(app, predicate, what, timeout_s=PUMP_TIMEOUT_S):
+    if not _pump(app, predicate, timeout_s):
+        raise BenchmarkError(f"timed out after {timeout_s:.1f}s waiting for {what}")
+
+
+def _flush_deferred_deletes(app):
+    from PyQt5.QtCore import QEvent
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _summarize(prefix, values_ms):
+    return {
+        f"{prefix}.mean_ms": sum(values_ms) / len(values_ms) if values_ms else None,
+        f"{prefix}.p50_ms": _percentile(values_ms, 0.5),
+        f"{prefix}.p95_ms": _percentile(values_ms, 0.95),
+        f"{prefix}.max_ms": max(values_ms) if values_ms else None,
+    }
+
+
+def run_startup_probe():
+    _prepare_environment()
+    module = _import_overlay_module()
+    imported_at = time.perf_counter()
+    app = module.AppWithGlobalKeyHandler(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    controller_ready_at = time.perf_counter()
+    tray_icon = module.create_tray_icon(app)
+    app.mark_startup("tray_visible")
+    app.processEvents()
+    tray_ready_at = time.perf_counter()
+    _pump(app, lambda: "idle_ready" in app.startup_timings, module.OVERLAY_PREWARM_DELAY_MS / 1000.0 + 5.0)
+    offset_ms = (module.PROCESS_STARTED_AT - PROCESS_STARTED_AT) * 1000.0
+    results = {
+        "startup.import_ms": (imported_at - PROCESS_STARTED_AT) * 1000.0,
+        "startup.controller_ms": (controller_ready_at - imported_at) * 1000.0,
+        "startup.tray_ready_ms": (tray_ready_at - PROCESS_STARTED_AT) * 1000.0,
+    }
+    for phase, elapsed_ms in app.startup_timings.items():
+        results[f"startup.phase.{phase}_ms"] = elapsed_ms + offset_ms
+    print(json.dumps(results))
+    tray_icon.hide()
+    app.settings.close()
+    return 0
+
+
+def measure_startup(runs=3):
+    samples = {}
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--startup-probe"],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ),
+        ).stdout
+        for key, value in json.loads(output.strip().splitlines()[-1]).items():
+            samples.setdefault(key, []).append(value)
+    return {key: min(values) for key, values in samples.items()}
+
+
+def _open_overlay(app, started_at):
+    app.last_open_latency_ms = None
+    app._hotkey_pressed_at = started_at
+    app.toggle_overlay()
+    _wait_for(app, lambda: app.last_open_latency_ms is not None, "the overlay to open")
+    return app.last_open_latency_ms
+
+
+def _close_overlay(app):
+    from PyQt5 import sip
+    overlay = app.overlay
+    app.toggle_overlay()
+    _wait_for(
+        app, lambda: overlay is None or sip.isdeleted(overlay) or not overlay.isVisible(), "the overlay to close"
+    )
+    _flush_deferred_deletes(app)
+
+
+def measure_toggles(module, app, toggles):
+    open_call_ms = []
+    first_frame_ms = []
+    close_ms = []
+    for _ in range(toggles):
+        started_at = time.perf_counter()
+        latency_ms = _open_overlay(app, started_at)
+        open_call_ms.append((time.perf_counter() - started_at) * 1000.0)
+        if latency_ms is not None:
+            first_frame_ms.append(latency_ms)
+        started_at = time.perf_counter()
+        _close_overlay(app)
+        close_ms.append((time.perf_counter() - started_at) * 1000.0)
+    metrics = {}
+    metrics.update(_summarize("toggle.open_settled", open_call_ms))
+    metrics.update(_summarize("toggle.first_frame", first_frame_ms))
+    metrics.update(_summarize("toggle.close_settled", close_ms))
+    return metrics
+
+
+def measure_paint(module, app, sizes, frames):
+    from PyQt5.QtGui import QImage
+    overlay = app._ensure_overlay()
+    metrics = {}
+    for width, height in sizes:
+        overlay.setGeometry(0, 0, width, height)
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        overlay._invalidate_render_cache()
+        started_at = time.perf_counter()
+        overlay.render(image)
+        metrics[f"paint.{width}x{height}.cold_ms"] = (time.perf_counter() - started_at) * 1000.0
+        warm_ms = []
+        for _ in range(frames):
+            started_at = time.perf_counter()
+            overlay.render(image)
+            warm_ms.append((time.perf_counter() - started_at) * 1000.0)
+        metrics[f"paint.{width}x{height}.warm_p50_ms"] = _percentile(warm_ms, 0.5)
+        metrics[f"paint.{width}x{height}.warm_p95_ms"] = _percentile(warm_ms, 0.95)
+    overlay.setGeometry(app.primaryScreen().geometry())
+    return metrics
+
+
+def measure_dirty_regions(module, app, drag_steps=DEFAULT_DRAG_STEPS):
+    from PyQt5.QtCore import QPoint
+    _open_overlay(app, time.perf_counter())
+    overlay = app.overlay
+    _pump(app, lambda: not overlay._fade_anim.state())
+    app.processEvents()
+    screen_pixels = overlay.width() * overlay.height()
+    metrics = {}
+
+    overlay.reset_paint_stats()
+    overlay.set_hotkey_name("F6" if overlay._hotkey_name != "F6" else "F7")
+    _pump(app, lambda: overlay.paint_events > 0, 0.5)
+    metrics["dirty.instruction_text.painted_fraction"] = overlay.painted_pixels / screen_pixels
+
+    overlay.reset_paint_stats()
+    overlay.settings_button.lock_state("pressed")
+    _pump(app, lambda: overlay.paint_events > 0, 0.5)
+    metrics["dirty.settings_button.painted_fraction"] = overlay.painted_pixels / screen_pixels
+    overlay.settings_button.unlock_state()
+    app.processEvents()
+
+    overlay._show_settings_panel()
+    app.processEvents()
+    overlay.reset_paint_stats()
+    for _ in range(drag_steps):
+        overlay.settings_panel._handle_drag(QPoint(3, 2))
+        app.processEvents()
+    metrics["dirty.panel_drag.painted_fraction_per_move"] = (
+        overlay.painted_pixels / screen_pixels / drag_steps
+    )
+    overlay.settings_panel.close_panel()
+    _close_overlay(app)
+    return metrics
+
+
+def measure_assets(module, lookups=DEFAULT_PAINT_FRAMES):
+    cache = module.AssetCache()
+    started = time.perf_counter()
+    cache.pixmap("banner.png", (256, 64), 2.0)
+    cold_ms = (time.perf_counter() - started) * 1000.0
+    started = time.perf_counter()
+    for _ in range(lookups):
+        cache.pixmap("banner.png", (256, 64), 2.0)
+    warm_ms = (time.perf_counter() - started) * 1000.0 / lookups
+    cache.set_budget(0)
+    stats = cache.stats()
+    return {
+        "assets.cold_lookup_ms": cold_ms,
+        "assets.warm_lookup_ms": warm_ms,
+        "assets.decodes": stats["decodes"],
+        "assets.evictions_at_zero_budget": stats["evictions"],
+    }
+
+
+def _build_app_tree(root, fmt, count):
+    import shutil
+    from appbundle import pack_app
+    template = _apps_dir() / "Test"
+    manifest = (template / "info.novr").read_text(encoding="utf-8")
+    apps_dir = root / fmt
+    apps_dir.mkdir()
+    for index in range(count):
+        app_dir = apps_dir / f"App{index:04d}"
+        shutil.copytree(template, app_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        (app_dir / "info.novr").write_text(
+            manifest.replace("alexvarl.testapp", f"bench.{fmt}.app{index}"), encoding="utf-8"
+        )
+        if fmt == "bundle":
+            pack_app(app_dir, remove_source=True)
+    return apps_dir
+
+
+def _time_discovery(module, apps_dir, index_file):
+    started_at = time.perf_counter()
+    registry = module.AppRegistry(apps_dir, index_file)
+    registry.scan()
+    return registry, (time.perf_counter() - started_at) * 1000.0
+
+
+def measure_app_discovery(module, count=DEFAULT_DISCOVERY_APPS):
+    metrics = {}
+    root = Path(tempfile.mkdtemp(prefix="nanoverlay-apps-"))
+    for fmt in ("directory", "bundle"):
+        apps_dir = _build_app_tree(root, fmt, count)
+        index_file = root / f"{fmt}_index.json"
+        _registry, cold_ms = _time_discovery(module, apps_dir, index_file)
+        registry, warm_ms = _time_discovery(module, apps_dir, index_file)
+        started_at = time.perf_counter()
+        registry.load_startup_apps()
+        load_ms = (time.perf_counter() - started_at) * 1000.0
+        failed = sum(1 for entry in registry.apps.values() if entry.load_error is not None)
+        metrics[f"discovery.{fmt}.{count}_apps.cold_scan_ms"] = cold_ms
+        metrics[f"discovery.{fmt}.{count}_apps.warm_scan_ms"] = warm_ms
+        metrics[f"discovery.{fmt}.{count}_apps.startup_ms"] = warm_ms + load_ms
+        metrics[f"discovery.{fmt}.{count}_apps.load_errors"] = failed
+        for entry in registry.apps.values():
+            sys.modules.pop("nanoverlay_app_" + entry.app_id.replace(".", "_"), None)
+    return metrics
+
+
+def _load_frame_stream_app():
+    import importlib.util
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    spec = importlib.util.spec_from_file_location("bench_framestream", _apps_dir() / "FrameStream" / "app.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _frame_producer(name, width, height, fps, duration, counter):
+    from framechannel import FrameChannel
+    channel = FrameChannel.attach(name)
+    counter.value = _load_frame_stream_app().stream(channel, width, height, fps, duration)
+    channel.close()
+
+
+def _pipe_producer(conn, width, height, duration):
+    app = _load_frame_stream_app()
+    stride = width * 4
+    started_at = time.monotonic()
+    frames = 0
+    while time.monotonic() - started_at < duration:
+        conn.send((frames, time.monotonic_ns(), app._row(width, frames * 4) * height, stride))
+        frames += 1
+    conn.send(None)
+    conn.close()
+
+
+def _consume_frames(source, painter, target, is_running):
+    consumed = 0
+    while is_running() or source.channel.write_seq // source.channel.slots > source.last_seq:
+        if source.poll():
+            source.draw(painter, target)
+            consumed += 1
+        else:
+            time.sleep(0.0005)
+    return consumed
+
+
+def measure_frame_channel(module, size=FRAME_SIZE, duration=FRAME_STREAM_SECONDS, rates=FRAME_STREAM_RATES):
+    import multiprocessing
+    from PyQt5.QtCore import QRect
+    from PyQt5.QtGui import QImage, QPainter
+    from framechannel import FrameChannel
+    context = multiprocessing.get_context("spawn")
+    width, height = size
+    target_image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    target = QRect(0, 0, width, height)
+    metrics = {}
+    for fps in rates:
+        label = f"frames.shm.{width}x{height}.{fps or 'max'}fps"
+        channel = FrameChannel.create(width * height * 4)
+        source = module.FrameChannelSource(channel)
+        counter = context.Value("i", 0)
+        producer = context.Process(
+            target=_frame_producer, args=(channel.name, width, height, fps, duration, counter)
+        )
+        producer.start()
+        painter = QPainter(target_image)
+        started_at = time.perf_counter()
+        consumed = _consume_frames(source, painter, target, producer.is_alive)
+        elapsed = time.perf_counter() - started_at
+        painter.end()
+        producer.join()
+        stats = source.stats()
+        metrics[f"{label}.published_fps"] = counter.value / duration
+        metrics[f"{label}.consumed_fps"] = consumed / elapsed
+        metrics[f"{label}.dropped"] = stats["dropped"]
+        metrics[f"{label}.torn"] = stats["torn"]
+        metrics[f"{label}.latency_p50_ms"] = stats["latency"]["p50_ms"]
+        metrics[f"{label}.latency_p95_ms"] = stats["latency"]["p95_ms"]
+        source.close()
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    producer = context.Process(target=_pipe_producer, args=(child_conn, width, height, duration))
+    producer.start()
+    child_conn.close()
+    received = 0
+    latency_ms = []
+    started_at = time.perf_counter()
+    while True:
+        message = parent_conn.recv()
+        if message is None:
+            break
+        _seq, published_ns, data, stride = message
+        QImage(data, width, height, stride, QImage.Format_ARGB32_Premultiplied)
+        latency_ms.append((time.monotonic_ns() - published_ns) / 1e6)
+        received += 1
+    elapsed = time.perf_counter() - started_at
+    producer.join()
+    metrics[f"frames.pipe.{width}x{height}.consumed_fps"] = received / elapsed
+    metrics[f"frames.pipe.{width}x{height}.latency_p50_ms"] = _percentile(latency_ms, 0.5)
+    metrics[f"frames.pipe.{width}x{height}.latency_p95_ms"] = _percentile(latency_ms, 0.95)
+    return metrics
+
+
+def _typing_stream(keys, hotkey_name):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    events = []
+    for index in range(keys):
+        key_name = hotkey_name if index % TYPING_HOTKEY_EVERY == 0 else letters[index % len(letters)]
+        events.append((index * 0.001, "press", key_name))
+        events.append((index * 0.001, "release", key_name))
+    return events
+
+
+def _send_qt_keys(app, window, events):
+    from PyQt5.QtCore import QEvent, Qt
+    from PyQt5.QtGui import QKeyEvent
+    for _offset, action, key_name in events:
+        key_name = key_name.upper()
+        if key_name.startswith("F") and key_name[1:].isdigit():
+            key = Qt.Key_F1 + int(key_name[1:]) - 1
+        else:
+            key = Qt.Key_A + ord(key_name) - ord("A")
+        kind = QEvent.KeyPress if action == "press" else QEvent.KeyRelease
+        app.sendEvent(window, QKeyEvent(kind, key, Qt.NoModifier, key_name.lower()))
+
+
+def measure_input_backends(module, app, keys=DEFAULT_TYPING_KEYS):
+    events = _typing_stream(keys, app.hotkey_name)
+    overlay = app._ensure_overlay()
+    overlay.winId()
+    metrics = {}
+    for name in ("replay", "qt"):
+        backend = module.create_input_backend(name)
+        registry = module.HotkeyRegistry(module.InputEventScheduler(True, 0), backend)
+        fired = []
+        registry.register("bench", app.hotkey_name, lambda: fired.append(time.perf_counter()))
+        backend.start(registry.on_press, registry.on_release)
+        if name == "replay":
+            backend.replay(events)
+        else:
+            _send_qt_keys(app, overlay.windowHandle(), events)
+        backend.stop()
+        summary = backend.dispatch_latency.summary()
+        metrics[f"input.{name}.events"] = backend.events
+        metrics[f"input.{name}.hotkeys_fired"] = len(fired)
+        metrics[f"input.{name}.dispatch_p50_ms"] = summary["p50_ms"]
+        metrics[f"input.{name}.dispatch_p95_ms"] = summary["p95_ms"]
+        metrics[f"input.{name}.dispatch_max_ms"] = summary["max_ms"]
+    return metrics
+
+
+async def _echo_handler(reader, writer):
+    try:
+        while True:
+            chunk = await reader.read(IO_PAYLOAD_BYTES)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def _echo_client(bridge, port, round_trips):
+    import asyncio
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = b"x" * IO_PAYLOAD_BYTES
+    for _ in range(round_trips):
+        writer.write(payload)
+        await writer.drain()
+        await reader.readexactly(IO_PAYLOAD_BYTES)
+        await bridge.offload(os.stat, str(BASE_DIR / "NANOverlay.py"))
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _io_load(bridge, clients, round_trips):
+    import asyncio
+    server = await asyncio.start_server(_echo_handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    started_at = time.perf_counter()
+    async with server:
+        await asyncio.gather(*(_echo_client(bridge, port, round_trips) for _ in range(clients)))
+    return time.perf_counter() - started_at
+
+
+def _frame_times(app, overlay, image, frames, keep_going=None):
+    frame_ms = []
+    while len(frame_ms) < frames or (keep_going is not None and keep_going()):
+        started_at = time.perf_counter()
+        overlay.update()
+        overlay.render(image)
+        app.processEvents()
+        frame_ms.append((time.perf_counter() - started_at) * 1000.0)
+    return frame_ms
+
+
+def measure_async_io(module, app, clients=DEFAULT_IO_CLIENTS, round_trips=DEFAULT_IO_ROUND_TRIPS):
+    from PyQt5.QtGui import QImage
+    overlay = app._ensure_overlay()
+    image = QImage(overlay.width(), overlay.height(), QImage.Format_ARGB32_Premultiplied)
+    bridge = app.async_bridge.start()
+    idle_ms = _frame_times(app, overlay, image, DEFAULT_PAINT_FRAMES)
+    future = bridge.submit(_io_load(bridge, clients, round_trips))
+    loaded_ms = _frame_times(app, overlay, image, DEFAULT_PAINT_FRAMES, keep_going=lambda: not future.done())
+    elapsed_s = future.result()
+    transferred = 2 * clients * round_trips * IO_PAYLOAD_BYTES
+    metrics = {}
+    metrics.update(_summarize("async_io.frame_idle", idle_ms))
+    metrics.update(_summarize("async_io.frame_loaded", loaded_ms))
+    metrics["async_io.throughput_mb_s"] = transferred / elapsed_s / (1024 * 1024)
+    metrics["async_io.offload_peak"] = bridge.stats()["offload_peak"]
+    return metrics
+
+
+def _window_renderer(painter, width, height):
+    from PyQt5.QtGui import QColor
+    for row in range(0, height, 4):
+        painter.fillRect(0, row, width, 2, QColor(row % 256, 90, 160))
+
+
+def measure_app_windows(module, app, counts=DEFAULT_WINDOW_COUNTS, frames=DEFAULT_PAINT_FRAMES):
+    from PyQt5.QtCore import QPoint
+    from PyQt5.QtGui import QImage
+    overlay = app._ensure_overlay()
+    image = QImage(overlay.width(), overlay.height(), QImage.Format_ARGB32_Premultiplied)
+    metrics = {}
+    for count in counts:
+        for index in range(count):
+            entry = module.AppEntry(BASE_DIR / "apps" / f"bench{index}", {
+                "app_id": f"bench.window{index}",
+                "window": "true",
+                "window_size": "150x300",
+                "minimizable": "true",
+            })
+            overlay.windows.open_window(entry, _window_renderer)
+        overlay.render(image)
+        renders_before = sum(window.render_count for window in overlay.windows.windows)
+        paint_ms = []
+        for _ in range(frames):
+            started_at = time.perf_counter()
+            overlay.render(image)
+            paint_ms.append((time.perf_counter() - started_at) * 1000.0)
+        top = overlay.windows.windows[-1]
+        move_ms = []
+        for step in range(frames):
+            started_at = time.perf_counter()
+            overlay.windows.move_window(top, top.rect.topLeft() + QPoint(1 if step % 2 else -1, 0))
+            overlay.render(image)
+            move_ms.append((time.perf_counter() - started_at) * 1000.0)
+        renders_after = sum(window.render_count for window in overlay.windows.windows)
+        metrics[f"windows.{count}.paint_p50_ms"] = _percentile(paint_ms, 0.5)
+        metrics[f"windows.{count}.move_p50_ms"] = _percentile(move_ms, 0.5)
+        metrics[f"windows.{count}.content_rerenders"] = renders_after - renders_before
+        for window in list(overlay.windows.windows):
+            if window.app_id.startswith("bench.window"):
+                overlay.windows.close_window(window.app_id)
+    return metrics
+
+
+def _heavy_content(painter, width, height, dt=None):
+    from PyQt5.QtGui import QColor
+    for row in range(height):
+        painter.fillRect(0, row, width, 1, QColor(row % 256, (row * 3) % 256, 160))
+    return True
+
+
+def measure_threaded_render(module, app, windows=4, duration=1.0):
+    import types
+    from PyQt5.QtGui import QImage
+    overlay = app._ensure_overlay()
+    image = QImage(overlay.width(), overlay.height(), QImage.Format_ARGB32_Premultiplied)
+    metrics = {}
+    for mode in ("gui_thread", "render_thread"):
+        opened = []
+        for index in range(windows):
+            entry = module.AppEntry(BASE_DIR / "apps" / f"render{index}", {
+                "app_id": f"bench.render{index}",
+                "window": "true",
+                "window_size": "400x300",
+                "frame_rate": "60",
+            })
+            entry.module = types.SimpleNamespace(render_frame=_heavy_content)
+            if mode == "gui_thread":
+                window = overlay.windows.open_window(entry, _heavy_content)
+            else:
+                window = overlay.windows.open_window(entry)
+                app.content_renderer.attach(entry, window, overlay.devicePixelRatioF())
+            opened.append(entry.app_id)
+        app.tick_scheduler.resume()
+        frame_ms = []
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            if mode == "gui_thread":
+                for app_id in opened:
+                    overlay.windows.invalidate_content(app_id)
+            app.processEvents()
+            started_at = time.perf_counter()
+            overlay.render(image)
+            frame_ms.append((time.perf_counter() - started_at) * 1000.0)
+        app.tick_scheduler.suspend()
+        metrics.update(_summarize(f"render.{mode}.{windows}_windows.gui_frame", frame_ms))
+        if mode == "render_thread":
+            stats = app.content_renderer.stats()
+            metrics[f"render.{mode}.{windows}_windows.content_fps"] = (
+                sum(item["rendered"] for item in stats.values()) / windows / duration
+            )
+            metrics[f"render.{mode}.{windows}_windows.busy_skipped"] = sum(
+                item["busy_skipped"] for item in stats.values()
+            )
+        for app_id in opened:
+            app.content_renderer.detach(app_id)
+            overlay.windows.close_window(app_id)
+    return metrics
+
+
+def measure_hot_reload(module, app, reloads=20):
+    app._start_idle_phase()
+    app_path = module.APPS_DIR / "Test"
+    reload_ms = []
+    for _ in range(reloads):
+        started_at = time.perf_counter()
+        app.reload_app_paths([app_path])
+        app.processEvents()
+        reload_ms.append((time.perf_counter() - started_at) * 1000.0)
+    return _summarize("reload.single_app", reload_ms)
+
+
+def measure_resource_accounting(module, app, samples=50):
+    monitor = app.resource_monitor
+    for index in range(20):
+        monitor.charge_callback(f"bench.usage{index}", 0.5)
+        monitor.charge_paint(f"bench.usage{index}", 0.5)
+    sample_ms = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        monitor.sample()
+        sample_ms.append((time.perf_counter() - started_at) * 1000.0)
+    for index in range(20):
+        monitor.usages.pop(f"bench.usage{index}", None)
+    return _summarize("accounting.sample", sample_ms)
+
+
+def _toggle_with_fade(module, app, toggles):
+    overlay = app._ensure_overlay()
+    overlay._fade_anim.setDuration(ISOLATION_FADE_DURATION_MS)
+    fade_selector = app.fade_selector
+    app.fade_selector = module.FadeModeSelector("opacity")
+    open_ms = []
+    fade_frame_ms = []
+    record_fade_frames = app.record_fade_frames
+
+    def record(strategy, frame_times_ms):
+        fade_frame_ms.extend(frame_times_ms)
+        record_fade_frames(strategy, frame_times_ms)
+
+    app.record_fade_frames = record
+    try:
+        for _ in range(toggles):
+            latency_ms = _open_overlay(app, time.perf_counter())
+            if latency_ms is not None:
+                open_ms.append(latency_ms)
+            _wait_for(app, lambda: overlay._fade_anim.state() == 0, "the fade-in to finish")
+            _close_overlay(app)
+    finally:
+        del app.record_fade_frames
+        app.fade_selector = fade_selector
+        overlay._fade_anim.setDuration(module.FADE_DURATION_MS)
+    return open_ms, fade_frame_ms
+
+
+def measure_worker_isolation(module, app, toggles=DEFAULT_ISOLATION_TOGGLES):
+    app._start_idle_phase()
+    metrics = {}
+    idle_open_ms, idle_fade_ms = _toggle_with_fade(module, app, toggles)
+    statuses = []
+
+    def on_ui_command(app_id, command, payload):
+        statuses.append(app_id)
+
+    if app.open_app(CPU_BURN_APP_ID) is None:
+        return metrics
+    app.app_ui_command.connect(on_ui_command)
+    try:
+        _pump(app, lambda: CPU_BURN_APP_ID in statuses, timeout_s=3.0)
+        burn_open_ms, burn_fade_ms = _toggle_with_fade(module, app, toggles)
+    finally:
+        app.app_ui_command.disconnect(on_ui_command)
+        app._stop_app(app.app_registry.get(CPU_BURN_APP_ID))
+    metrics.update(_summarize("isolation.idle.first_frame", idle_open_ms))
+    metrics.update(_summarize("isolation.idle.fade_frame", idle_fade_ms))
+    metrics.update(_summarize("isolation.cpuburn.first_frame", burn_open_ms))
+    metrics.update(_summarize("isolation.cpuburn.fade_frame", burn_fade_ms))
+    metrics["isolation.cpuburn.status_reports"] = statuses.count(CPU_BURN_APP_ID)
+    return metrics
+
+
+def _qobject_count(app):
+    from PyQt5 import sip
+    from PyQt5.QtCore import QObject
+    from PyQt5.QtWidgets import QApplication
+    seen = set()
+    roots = [app] + QApplication.topLevelWidgets()
+    for obj in gc.get_objects():
+        if isinstance(obj, QObject) and not sip.isdeleted(obj) and obj.parent() is None:
+            roots.append(obj)
+    for root in roots:
+        for obj in [root] + root.findChildren(QObject):
+            seen.add(sip.unwrapinstance(obj))
+    return len(seen)
+
+
+def measure_cycles(module, app, cycles, resident):
+    from PyQt5.QtWidgets import QApplication
+    label = "resident" if resident else "rebuild"
+    previous = module.RESIDENT_OVERLAY
+    module.RESIDENT_OVERLAY = resident
+    if app.overlay is not None:
+        app.overlay._resident = resident
+    try:
+        _open_overlay(app, time.perf_counter())
+        _close_overlay(app)
+        gc.collect()
+        _flush_deferred_deletes(app)
+        rss_before = _rss_bytes()
+        widgets_before = len(QApplication.allWidgets())
+        qobjects_before = _qobject_count(app)
+        for _ in range(cycles):
+            _open_overlay(app, time.perf_counter())
+            _close_overlay(app)
+        gc.collect()
+        _flush_deferred_deletes(app)
+        rss_after = _rss_bytes()
+        widgets_after = len(QApplication.allWidgets())
+        qobjects_after = _qobject_count(app)
+    finally:
+        module.RESIDENT_OVERLAY = previous
+    return {
+        f"cycles.{label}.rss_growth_kb": (rss_after - rss_before) / 1024.0,
+        f"cycles.{label}.widget_growth": widgets_after - widgets_before,
+        f"cycles.{label}.qobject_growth": qobjects_after - qobjects_before,
+    }
+
+
+def run_benchmarks(args):
+    _prepare_environment()
+    metrics = {}
+    if not args.skip_startup:
+        metrics.update(measure_startup())
+    module = _import_overlay_module()
+    app = module.AppWithGlobalKeyHandler(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    app._start_input_phase()
+    app.fade_selector = module.FadeModeSelector("instant")
+    metrics.update(measure_toggles(module, app, args.toggles))
+    metrics.update(measure_input_backends(module, app))
+    metrics.update(measure_paint(module, app, args.sizes, args.paint_frames))
+    metrics.update(measure_dirty_regions(module, app))
+    metrics.update(measure_app_windows(module, app))
+    metrics.update(measure_threaded_render(module, app))
+    metrics.update(measure_assets(module))
+    metrics.update(measure_app_discovery(module))
+    metrics.update(measure_hot_reload(module, app))
+    metrics.update(measure_resource_accounting(module, app))
+    metrics.update(measure_worker_isolation(module, app))
+    restart_ms = metrics.get("startup.phase.idle_ready_ms")
+    if restart_ms and metrics.get("reload.single_app.p50_ms"):
+        metrics["reload.restart_to_reload_ratio"] = restart_ms / metrics["reload.single_app.p50_ms"]
+    metrics.update(measure_async_io(module, app))
+    metrics.update(measure_frame_channel(module))
+    metrics.update(measure_cycles(module, app, args.cycles, resident=True))
+    if app.overlay is not None:
+        app.overlay.deleteLater()
+        _flush_deferred_deletes(app)
+        app.overlay = None
+    metrics.update(measure_cycles(module, app, args.cycles, resident=False))
+    app.settings.close()
+    from PyQt5.QtCore import QT_VERSION_STR
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": os.environ.get("QT_QPA_PLATFORM"),
+        "metrics": metrics,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    base_metrics = baseline.get("metrics", {})
+    for name, value in results.get("metrics", {}).items():
+        base_value = base_metrics.get(name)
+        if value is None or base_value is None:
+            continue
+        margin = max(abs(base_value) * tolerance, MIN_REGRESSION_DELTA)
+        if name.endswith(HIGHER_IS_BETTER):
+            regressed = value < base_value - margin
+            symbol = "<"
+        else:
+            regressed = value > base_value + margin
+            symbol = ">"
+        if regressed:
+            regressions.append(
+                {"metric": name, "baseline": base_value, "value": value, "symbol": symbol}
+            )
+    return regressions
+
+
+def check_limits(results, limits=METRIC_LIMITS):
+    failures = []
+    metrics = results.get("metrics", {})
+    for name, limit in limits.items():
+        value = metrics.get(name)
+        if value is not None and value > limit:
+            failures.append({"metric": name, "limit": limit, "value": value})
+    return failures
+
+
+def _parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Headless NANOverlay benchmarks")
+    parser.add_argument("--output", help="write results JSON to this path")
+    parser.add_argument("--baseline", help="compare against a stored results JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--toggles", type=int, default=DEFAULT_TOGGLES)
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument("--paint-frames", type=int, default=DEFAULT_PAINT_FRAMES)
+    parser.add_argument("--sizes", type=_parse_size, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--skip-startup", action="store_true")
+    parser.add_argument("--startup-probe", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.startup_probe:
+        return run_startup_probe()
+    try:
+        results = run_benchmarks(args)
+    except BenchmarkError as exc:
+        print(f"benchmark failed: {exc}", file=sys.stderr)
+        return 1
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    failed = False
+    for failure in check_limits(results):
+        print(
+            f"LIMIT {failure['metric']}: {failure['value']:.3f} > limit {failure['limit']:.3f}",
+            file=sys.stderr,
+        )
+        failed = True
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['metric']}: "
+                f"{regression['value']:.3f} {regression['symbol']} baseline {regression['baseline']:.3f}",
+                file=sys.stderr,
+            )
+        if regressions:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import struct
+import time
+from multiprocessing import shared_memory
+
+FRAME_CHANNEL_MAGIC = b"NANOFRM1"
+FRAME_CHANNEL_SLOTS = 3
+FRAME_CHANNEL_ALIGN = 64
+FRAME_BYTES_PER_PIXEL = 4
+NO_SLOT = 0xFFFFFFFF
+HEADER = struct.Struct("<8sIIIIQ")
+HEADER_READER_SLOT_OFFSET = 16
+HEADER_WRITE_SEQ_OFFSET = 24
+SLOT_HEADER = struct.Struct("<QIIIIQ")
+
+
+def _aligned(size):
+    return (size + FRAME_CHANNEL_ALIGN - 1) // FRAME_CHANNEL_ALIGN * FRAME_CHANNEL_ALIGN
+
+
+def frame_layout_error(width, height, stride, nbytes, slot_bytes):
+    if width <= 0 or height <= 0:
+        return f"empty frame {width}x{height}"
+    if stride < width * FRAME_BYTES_PER_PIXEL:
+        return f"stride {stride} is shorter than a {width} pixel row"
+    if stride * height > nbytes:
+        return f"{height} rows of stride {stride} exceed the {nbytes} byte frame"
+    if nbytes > slot_bytes:
+        return f"frame of {nbytes} bytes exceeds the {slot_bytes} byte slot"
+    return None
+
+
+def _attach_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class Frame:
+    def __init__(self, seq, slot, width, height, stride, data, published_ns, dropped, error=None):
+        self.seq = seq
+        self.slot = slot
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self.data = data
+        self.published_ns = published_ns
+        self.dropped = dropped
+        self.error = error
+
+    @property
+    def age_ms(self):
+        return (time.monotonic_ns() - self.published_ns) / 1e6
+
+
+class FrameChannel:
+    def __init__(self, memory, owner):
+        self._memory = memory
+        self._owner = owner
+        self._buf = memory.buf
+        magic, slots, slot_bytes, _reader_slot, _pad, _write_seq = HEADER.unpack_from(self._buf, 0)
+        if magic != FRAME_CHANNEL_MAGIC:
+            raise ValueError(f"{memory.name} is not a frame channel")
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._data_offset = _aligned(SLOT_HEADER.size)
+        self._slot_stride = self._data_offset + _aligned(slot_bytes)
+        self._first_slot = _aligned(HEADER.size)
+        self._next_seq = self.write_seq // self.slots + 1
+        self.published = 0
+        self.acquired = 0
+        self.dropped = 0
+        self.retries = 0
+        self.rejected = 0
+
+    @classmethod
+    def create(cls, slot_bytes, slots=FRAME_CHANNEL_SLOTS, name=None):
+        if slots < 3:
+            raise ValueError("a frame channel needs at least three slots")
+        size = _aligned(HEADER.size) + slots * (_aligned(SLOT_HEADER.size) + _aligned(slot_bytes))
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        HEADER.pack_into(memory.buf, 0, FRAME_CHANNEL_MAGIC, slots, slot_bytes, NO_SLOT, 0, 0)
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_attach_shared_memory(name), owner=False)
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    @property
+    def write_seq(self):
+        return struct.unpack_from("<Q", self._buf, HEADER_WRITE_SEQ_OFFSET)[0]
+
+    @property
+    def reader_slot(self):
+        return struct.unpack_from("<I", self._buf, HEADER_READER_SLOT_OFFSET)[0]
+
+    def _slot_offset(self, slot):
+        return self._first_slot + slot * self._slot_stride
+
+    def _slot_header(self, slot):
+        return SLOT_HEADER.unpack_from(self._buf, self._slot_offset(slot))
+
+    def _slot_data(self, slot, nbytes):
+        start = self._slot_offset(slot) + self._data_offset
+        return self._buf[start:start + nbytes]
+
+    def begin_frame(self):
+        seq = self._next_seq
+        slot = seq % self.slots
+        held = self.reader_slot
+        latest = self.write_seq % self.slots if self.write_seq else NO_SLOT
+        while slot == held or slot == latest:
+            slot = (slot + 1) % self.slots
+        SLOT_HEADER.pack_into(self._buf, self._slot_offset(slot), 0, 0, 0, 0, 0, 0)
+        return slot, self._slot_data(slot, self.slot_bytes)
+
+    def commit(self, slot, width, height, stride, nbytes=None):
+        seq = self._next_seq
+        nbytes = stride * height if nbytes is None else nbytes
+        error = frame_layout_error(width, height, stride, nbytes, self.slot_bytes)
+        if error is not None:
+            raise ValueError(error)
+        SLOT_HEADER.pack_into(
+            self._buf, self._slot_offset(slot), seq, width, height, stride, nbytes, time.monotonic_ns()
+        )
+        struct.pack_into("<Q", self._buf, HEADER_WRITE_SEQ_OFFSET, seq * self.slots + slot)
+        self._next_seq = seq + 1
+        self.published += 1
+        return seq
+
+    def publish(self, data, width, height, stride):
+        slot, view = self.begin_frame()
+        nbytes = len(data)
+        view[:nbytes] = data
+        return self.commit(slot, width, height, stride, nbytes)
+
+    def acquire(self, last_seq=0):
+        while True:
+            packed = self.write_seq
+            if not packed:
+                return None
+            seq, slot = divmod(packed, self.slots)
+            if seq <= last_seq:
+                return None
+            struct.pack_into("<I", self._buf, HEADER_READER_SLOT_OFFSET, slot)
+            slot_seq, width, height, stride, nbytes, published_ns = self._slot_header(slot)
+            if slot_seq == seq:
+                break
+            self.retries += 1
+        dropped = max(0, seq - last_seq - 1) if last_seq else 0
+        self.acquired += 1
+        self.dropped += dropped
+        error = frame_layout_error(width, height, stride, nbytes, self.slot_bytes)
+        if error is not None:
+            self.rejected += 1
+            return Frame(seq, slot, width, height, stride, None, published_ns, dropped, error)
+        return Frame(seq, slot, width, height, stride, self._slot_data(slot, nbytes), published_ns, dropped)
+
+    def is_intact(self, frame):
+        return self._buf is not None and self._slot_header(frame.slot)[0] == frame.seq
+
+    def release(self):
+        struct.pack_into("<I", self._buf, HEADER_READER_SLOT_OFFSET, NO_SLOT)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "slot_bytes": self.slot_bytes,
+            "published": self.published,
+            "acquired": self.acquired,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "rejected": self.rejected,
+        }
+
+    def close(self):
+        self._buf = None
+        try:
+            self._memory.close()
+        except BufferError:
+            return False
+        if self._owner:
+            try:
+                self._memory.unlink()
+            except FileNotFoundError:
+                pass
+        return True
@@ -0,0 +1,131 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+
+CONTROL_SOCKET_NAME = "nanoverlay-control"
+CONTROL_TIMEOUT_S = 2.0
+CONTROL_COMMANDS = (
+    "ping", "toggle", "close", "set-hotkey", "open-app", "reload-apps", "stalls", "usage", "resume-app", "quit"
+)
+
+
+def control_socket_path():
+    override = os.environ.get("NANOVERLAY_SOCKET")
+    if override:
+        return override
+    if os.name == "nt":
+        return CONTROL_SOCKET_NAME
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"{CONTROL_SOCKET_NAME}-{os.getuid()}.sock")
+
+
+def encode_request(command, args=()):
+    return (json.dumps({"command": command, "args": list(args)}) + "\n").encode("utf-8")
+
+
+def _request_unix(path, payload, timeout):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(payload)
+        buffer = b""
+        while b"\n" not in buffer:
+            chunk = client.recv(4096)
+            if not chunk:
+                break
+            buffer += chunk
+    return buffer
+
+
+def _request_qt(name, payload, timeout):
+    from PyQt5.QtNetwork import QLocalSocket
+    client = QLocalSocket()
+    client.connectToServer(name)
+    timeout_ms = int(timeout * 1000)
+    if not client.waitForConnected(timeout_ms):
+        raise ConnectionError(client.errorString())
+    client.write(payload)
+    client.waitForBytesWritten(timeout_ms)
+    buffer = b""
+    while b"\n" not in buffer and client.waitForReadyRead(timeout_ms):
+        buffer += bytes(client.readAll())
+    client.disconnectFromServer()
+    return buffer
+
+
+def send_command(command, args=(), path=None, timeout=CONTROL_TIMEOUT_S):
+    path = path or control_socket_path()
+    payload = encode_request(command, args)
+    try:
+        if hasattr(socket, "AF_UNIX") and os.name != "nt":
+            buffer = _request_unix(path, payload, timeout)
+        else:
+            buffer = _request_qt(path, payload, timeout)
+    except (OSError, ConnectionError):
+        return None
+    line = buffer.split(b"\n", 1)[0]
+    if not line:
+        return None
+    try:
+        return json.loads(line.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def control_socket_in_use(path=None, timeout=CONTROL_TIMEOUT_S):
+    path = path or control_socket_path()
+    if hasattr(socket, "AF_UNIX") and os.name != "nt":
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            try:
+                client.connect(path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                return False
+            except OSError:
+                return True
+        return True
+    from PyQt5.QtNetwork import QLocalSocket
+    client = QLocalSocket()
+    client.connectToServer(path)
+    if client.waitForConnected(int(timeout * 1000)):
+        client.disconnectFromServer()
+        return True
+    return client.error() not in (QLocalSocket.ServerNotFoundError, QLocalSocket.ConnectionRefusedError)
+
+
+def start_instance():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    if base_dir not in sys.path:
+        sys.path.insert(0, base_dir)
+    import NANOverlay
+    NANOverlay.main()
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        reply = send_command("toggle")
+        if reply is None:
+            start_instance()
+        return 0
+    command, args = argv[0], argv[1:]
+    if command not in CONTROL_COMMANDS:
+        print(f"unknown command: {command} (expected one of {', '.join(CONTROL_COMMANDS)})", file=sys.stderr)
+        return 2
+    reply = send_command(command, args)
+    if reply is None:
+        print("NANOverlay is not running", file=sys.stderr)
+        return 1
+    if not reply.get("ok"):
+        print(reply.get("error") or "command failed", file=sys.stderr)
+        return 1
+    result = reply.get("result")
+    if result is not None:
+        print(json.dumps(result) if not isinstance(result, str) else result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())